@@ -2,14 +2,30 @@
 db.py — SQLite connection and shared helpers.
 Used by scraper, alerts engine, and admin CLI.
 """
+import atexit
 import sqlite3
 import os
 from pathlib import Path
-from contextlib import contextmanager
+from contextlib import closing, contextmanager
 from typing import Optional
 
 # Default DB path — can be overridden via env var (useful in tests)
 DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "yardgoats.db"
+SCHEMA_PATH     = Path(__file__).parent.parent / "data" / "schema.sql"
+
+# Long-lived connections shared by every get_conn() call in this process,
+# one per DB path — opening another path never closes one still in use
+_CONNS: dict[Path, sqlite3.Connection] = {}
+
+_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA busy_timeout = 5000",
+)
 
 
 def get_db_path() -> Path:
@@ -19,52 +35,123 @@ def get_db_path() -> Path:
 def init_db(db_path: Optional[Path] = None) -> None:
     """Create all tables from schema.sql if they don't exist."""
     db_path = db_path or get_db_path()
-    schema_path = Path(__file__).parent.parent / "data" / "schema.sql"
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(db_path) as conn:
-        conn.executescript(schema_path.read_text())
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.executescript(SCHEMA_PATH.read_text())
         conn.commit()
 
 
-@contextmanager
-def get_conn(db_path: Optional[Path] = None):
-    """Context manager yielding a sqlite3 connection with row_factory set."""
-    db_path = db_path or get_db_path()
-    conn = sqlite3.connect(db_path)
+def _configure(conn: sqlite3.Connection) -> None:
+    """Apply per-connection tuning PRAGMAs."""
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+
+
+def _get_shared_conn(db_path: Path) -> sqlite3.Connection:
+    conn = _CONNS.get(db_path)
+    if conn is None:
+        conn = _CONNS[db_path] = sqlite3.connect(db_path, cached_statements=256)
+        _configure(conn)
+    return conn
+
+
+def close_db() -> None:
+    """
+    Close every shared connection (tests call this in teardown).
+    Switches back to a rollback journal first so the WAL is folded into
+    the main file — the committed DB is opened read-only by the dashboard.
+    """
+    while _CONNS:
+        _, conn = _CONNS.popitem()
+        try:
+            conn.execute("PRAGMA journal_mode = DELETE")
+        except sqlite3.Error:
+            pass
+        conn.close()
+
+
+atexit.register(close_db)
+
+
+@contextmanager
+def get_conn(db_path: Optional[Path] = None, write: bool = False):
+    """
+    Context manager yielding the shared sqlite3 connection for db_path.
+    Commits on exit (rolls back on error) but leaves the connection open.
+    Pass write=True to take the write lock up front with BEGIN IMMEDIATE
+    instead of upgrading a deferred transaction on the first write.
+    Like transaction(), a get_conn entered while the connection already has
+    a transaction open joins it — the outer block commits or rolls back.
+    """
+    conn = _get_shared_conn(Path(db_path or get_db_path()))
+    if conn.in_transaction:
+        yield conn
+        return
+    if write:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection):
+    """
+    Wrap a block of writes in one explicit BEGIN IMMEDIATE … COMMIT.
+    Joins the caller's transaction if one is already open.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE")
     try:
         yield conn
         conn.commit()
     except Exception:
         conn.rollback()
         raise
-    finally:
-        conn.close()
 
 
 # ── Game helpers ─────────────────────────────────────────
 
+# RETURNING needs SQLite 3.35+; older builds fall back to a follow-up SELECT
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+_UPSERT_GAME_SQL = """
+    INSERT INTO games (game_date, day_of_week, start_time, opponent, is_home, ticket_url, updated_at)
+    VALUES (:game_date, :day_of_week, :start_time, :opponent, :is_home, :ticket_url, CURRENT_TIMESTAMP)
+    ON CONFLICT(game_date) DO UPDATE SET
+        day_of_week = excluded.day_of_week,
+        start_time  = excluded.start_time,
+        opponent    = excluded.opponent,
+        is_home     = excluded.is_home,
+        ticket_url  = excluded.ticket_url,
+        updated_at  = CURRENT_TIMESTAMP
+"""
+
+
 def upsert_game(conn: sqlite3.Connection, game: dict) -> int:
     """
     Insert or update a game record keyed on game_date.
     Returns the game id.
     """
-    conn.execute("""
-        INSERT INTO games (game_date, day_of_week, start_time, opponent, is_home, ticket_url, updated_at)
-        VALUES (:game_date, :day_of_week, :start_time, :opponent, :is_home, :ticket_url, CURRENT_TIMESTAMP)
-        ON CONFLICT(game_date) DO UPDATE SET
-            day_of_week = excluded.day_of_week,
-            start_time  = excluded.start_time,
-            opponent    = excluded.opponent,
-            is_home     = excluded.is_home,
-            ticket_url  = excluded.ticket_url,
-            updated_at  = CURRENT_TIMESTAMP
-    """, game)
+    if _HAS_RETURNING:
+        row = conn.execute(_UPSERT_GAME_SQL + " RETURNING id", game).fetchone()
+        return row["id"]
+    conn.execute(_UPSERT_GAME_SQL, game)
     row = conn.execute("SELECT id FROM games WHERE game_date = ?", (game["game_date"],)).fetchone()
     return row["id"]
 
 
+def upsert_games_batch(conn: sqlite3.Connection, games: list[dict]) -> None:
+    """Bulk variant of upsert_game — one prepared statement for all games."""
+    conn.executemany(_UPSERT_GAME_SQL, games)
+
+
 def get_games_on_date(conn: sqlite3.Connection, date_str: str) -> list:
     """Return all home games for a given YYYY-MM-DD date string."""
     return conn.execute(
@@ -72,6 +159,17 @@ def get_games_on_date(conn: sqlite3.Connection, date_str: str) -> list:
     ).fetchall()
 
 
+def get_games_on_dates(conn: sqlite3.Connection, date_strs: list[str]) -> list:
+    """Return all home games on any of the given YYYY-MM-DD dates in one query."""
+    if not date_strs:
+        return []
+    placeholders = ",".join("?" * len(date_strs))
+    return conn.execute(
+        f"SELECT * FROM games WHERE game_date IN ({placeholders}) AND is_home = 1",
+        list(date_strs)
+    ).fetchall()
+
+
 def get_weekend_games_on_date(conn: sqlite3.Connection, date_str: str) -> list:
     """Return Fri/Sat/Sun home games for a given date."""
     return conn.execute(
@@ -96,11 +194,24 @@ def upsert_promotions(conn: sqlite3.Connection, game_id: int, promos: list[dict]
     Each promo dict must have: promo_type, description.
     """
     conn.execute("DELETE FROM promotions WHERE game_id = ?", (game_id,))
-    for promo in promos:
-        conn.execute("""
-            INSERT INTO promotions (game_id, promo_type, description)
-            VALUES (?, ?, ?)
-        """, (game_id, promo["promo_type"], promo.get("description", "")))
+    conn.executemany("""
+        INSERT INTO promotions (game_id, promo_type, description)
+        VALUES (?, ?, ?)
+    """, ((game_id, p["promo_type"], p.get("description", "")) for p in promos))
+
+
+def upsert_promotions_batch(conn: sqlite3.Connection, promos_by_game: dict[int, list[dict]]) -> None:
+    """Bulk variant of upsert_promotions: replace promotions for many games at once."""
+    conn.executemany(
+        "DELETE FROM promotions WHERE game_id = ?", ((gid,) for gid in promos_by_game)
+    )
+    conn.executemany("""
+        INSERT INTO promotions (game_id, promo_type, description)
+        VALUES (?, ?, ?)
+    """, (
+        (gid, p["promo_type"], p.get("description", ""))
+        for gid, promos in promos_by_game.items() for p in promos
+    ))
 
 
 def get_promotions_for_game(conn: sqlite3.Connection, game_id: int) -> list:
@@ -121,10 +232,22 @@ def add_recipient(conn: sqlite3.Connection, name: str, phone: Optional[str], ema
     return cursor.lastrowid
 
 
-def list_recipients(conn: sqlite3.Connection, active_only: bool = True) -> list:
+RECIPIENT_COLUMNS = ("id", "name", "phone", "email", "active")
+
+
+def list_recipients(
+    conn: sqlite3.Connection,
+    active_only: bool = True,
+    cols: tuple[str, ...] = ("id", "name", "phone", "email"),
+) -> list:
+    """Return recipients, projecting only `cols` (must be in RECIPIENT_COLUMNS)."""
+    unknown = set(cols) - set(RECIPIENT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown recipient column(s): {', '.join(sorted(unknown))}")
+    sql = f"SELECT {', '.join(cols)} FROM recipients"
     if active_only:
-        return conn.execute("SELECT * FROM recipients WHERE active = 1").fetchall()
-    return conn.execute("SELECT * FROM recipients").fetchall()
+        sql += " WHERE active = 1"
+    return conn.execute(sql).fetchall()
 
 
 def deactivate_recipient(conn: sqlite3.Connection, recipient_id: int) -> bool:
@@ -143,23 +266,43 @@ def reactivate_recipient(conn: sqlite3.Connection, recipient_id: int) -> bool:
 
 # ── Alert deduplication helpers ──────────────────────────
 
+_HAS_ALERT_SQL = (
+    "SELECT 1 FROM alerts_sent WHERE game_id=? AND recipient_id=? AND channel=? LIMIT 1"
+)
+# Upsert against UNIQUE(game_id, recipient_id, channel) — updates in place
+# rather than the delete + insert that INSERT OR REPLACE performs
+_LOG_ALERT_SQL = """INSERT INTO alerts_sent (game_id, recipient_id, channel, status, sent_at)
+           VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+           ON CONFLICT(game_id, recipient_id, channel) DO UPDATE SET
+               status  = excluded.status,
+               sent_at = CURRENT_TIMESTAMP"""
+
+
 def has_alert_been_sent(conn: sqlite3.Connection, game_id: int, recipient_id: int, channel: str) -> bool:
-    row = conn.execute(
-        "SELECT id FROM alerts_sent WHERE game_id=? AND recipient_id=? AND channel=?",
-        (game_id, recipient_id, channel)
-    ).fetchone()
+    row = conn.execute(_HAS_ALERT_SQL, (game_id, recipient_id, channel)).fetchone()
     return row is not None
 
 
+def get_sent_alerts_for_game(conn: sqlite3.Connection, game_id: int) -> set[tuple[int, str]]:
+    """Return the (recipient_id, channel) pairs already logged for a game."""
+    return {
+        (r["recipient_id"], r["channel"])
+        for r in conn.execute(
+            "SELECT recipient_id, channel FROM alerts_sent WHERE game_id = ?", (game_id,)
+        )
+    }
+
+
 def log_alert(conn: sqlite3.Connection, game_id: int, recipient_id: int, channel: str, status: str) -> int:
-    cursor = conn.execute(
-        """INSERT OR REPLACE INTO alerts_sent (game_id, recipient_id, channel, status, sent_at)
-           VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)""",
-        (game_id, recipient_id, channel, status)
-    )
+    cursor = conn.execute(_LOG_ALERT_SQL, (game_id, recipient_id, channel, status))
     return cursor.lastrowid
 
 
+def log_alerts(conn: sqlite3.Connection, rows: list[tuple[int, int, str, str]]) -> None:
+    """Bulk variant of log_alert for (game_id, recipient_id, channel, status) rows."""
+    conn.executemany(_LOG_ALERT_SQL, rows)
+
+
 def get_alert_log(conn: sqlite3.Connection, game_id: Optional[int] = None) -> list:
     if game_id:
         return conn.execute(
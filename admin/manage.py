@@ -16,21 +16,21 @@ from pathlib import Path
 # Allow running from any directory
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from admin.db import get_conn, init_db, add_recipient, list_recipients, \
-    deactivate_recipient, reactivate_recipient, get_data_freshness
+    deactivate_recipient, reactivate_recipient, get_data_freshness, RECIPIENT_COLUMNS
 
 
 def cmd_add(args):
     if not args.phone and not args.email:
         print("ERROR: Provide at least --phone or --email.")
         sys.exit(1)
-    with get_conn() as conn:
+    with get_conn(write=True) as conn:
         rid = add_recipient(conn, args.name, args.phone, args.email)
     print(f"✅ Added recipient id={rid}  name='{args.name}'  phone={args.phone or '—'}  email={args.email or '—'}")
 
 
 def cmd_list(args):
     with get_conn() as conn:
-        rows = list_recipients(conn, active_only=not args.all)
+        rows = list_recipients(conn, active_only=not args.all, cols=RECIPIENT_COLUMNS)
     if not rows:
         print("No recipients found.")
         return
@@ -42,7 +42,7 @@ def cmd_list(args):
 
 
 def cmd_remove(args):
-    with get_conn() as conn:
+    with get_conn(write=True) as conn:
         ok = deactivate_recipient(conn, args.id)
     if ok:
         print(f"✅ Deactivated recipient id={args.id}  (record kept for audit; use 'restore' to re-enable)")
@@ -52,7 +52,7 @@ def cmd_remove(args):
 
 
 def cmd_restore(args):
-    with get_conn() as conn:
+    with get_conn(write=True) as conn:
         ok = reactivate_recipient(conn, args.id)
     if ok:
         print(f"✅ Restored recipient id={args.id}")
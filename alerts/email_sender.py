@@ -11,23 +11,24 @@ Per FR-22 through FR-26:
 import logging
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+try:
+    from sendgrid.helpers.mail import Mail, To, From, Subject, HtmlContent
+    _HAVE_SG = True
+except ImportError:
+    _HAVE_SG = False
+
 logger = logging.getLogger(__name__)
 
 TEMPLATE_PATH = Path(__file__).parent / "templates" / "alert_email.html"
 FROM_EMAIL    = "alerts@yardgoatstracker.app"
 FROM_NAME     = "Yard Goats Alerts"
 
-PROMO_ICONS = {
-    "giveaway":  "🎁",
-    "fireworks": "🎆",
-    "discount":  "💰",
-    "theme":     "🎭",
-    "heritage":  "⚾",
-    "special":   "⭐",
-}
+# Matches both "{{ key }}" and "{{key}}" spellings
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
 
 
 def send_email(
@@ -36,6 +37,7 @@ def send_email(
     payload:  dict,
     dry_run:  bool = False,
     client=None,
+    html_body: Optional[str] = None,
 ) -> tuple[bool, str]:
     """
     Send an HTML alert email via SendGrid.
@@ -46,11 +48,14 @@ def send_email(
         payload:  Alert payload dict from engine.build_alert_payload()
         dry_run:  If True, render but do not send
         client:   Optional pre-built SendGrid client (for tests)
+        html_body: Pre-rendered HTML (from render_alert_html); rendered
+                   from payload when omitted
 
     Returns:
         (success: bool, status_detail: str)
     """
-    html_body = _render_template(payload)
+    if html_body is None:
+        html_body = render_alert_html(payload)
 
     if dry_run:
         logger.info("[dry-run] Email to %s | Subject: %s", _mask(to_email), subject)
@@ -63,15 +68,14 @@ def send_email(
 
     try:
         # Build message — handle missing sendgrid gracefully (test clients use duck typing)
-        try:
-            from sendgrid.helpers.mail import Mail, To, From, Subject, HtmlContent
+        if _HAVE_SG:
             message = Mail(
                 from_email=From(FROM_EMAIL, FROM_NAME),
                 to_emails=To(to_email),
                 subject=Subject(subject),
                 html_content=HtmlContent(html_body),
             )
-        except ImportError:
+        else:
             # sendgrid not installed — pass dict; injectable clients handle it
             message = {"from": FROM_EMAIL, "to": to_email,
                        "subject": subject, "html": html_body}
@@ -94,25 +98,23 @@ def send_email(
         return False, f"exception: {exc}"
 
 
-def _render_template(payload: dict) -> str:
+def render_alert_html(payload: dict) -> str:
     """
     Minimal template renderer — replaces {{ var }} placeholders.
     """
-    template = TEMPLATE_PATH.read_text()
+    template = _get_template()
 
     # Build promo list HTML
     if payload.get("promos"):
-        items = ""
-        for promo in payload["promos"]:
-            pt   = promo["promo_type"]
-            desc = promo["description"]
-            items += f'<li class="badge-{pt}">{desc}</li>\n'
+        items = "".join(
+            f'<li class="badge-{promo["promo_type"]}">{promo["description"]}</li>\n'
+            for promo in payload["promos"]
+        )
         promo_list = f"<ul>\n{items}</ul>"
     else:
         promo_list = '<p class="badge-tbd">Promotions TBD</p>'
 
-    # Replace {{ var }} placeholders
-    html = template
+    # Replace {{ var }} placeholders in a single pass
     replacements = {
         "day":          payload.get("day", ""),
         "display_date": payload.get("display_date", ""),
@@ -122,11 +124,15 @@ def _render_template(payload: dict) -> str:
         "promo_list":   promo_list,
         "ticket_url":   payload.get("ticket_url", "#"),
     }
-    for key, value in replacements.items():
-        html = html.replace("{{ " + key + " }}", str(value))
-        html = html.replace("{{" + key + "}}", str(value))
+    return _PLACEHOLDER_RE.sub(
+        lambda m: str(replacements.get(m.group(1), m.group(0))), template
+    )
+
 
-    return html
+@lru_cache(maxsize=1)
+def _get_template() -> str:
+    """Read the email template once per process."""
+    return TEMPLATE_PATH.read_text()
 
 
 def _get_sendgrid_client():
@@ -10,26 +10,62 @@ Responsibilities:
   - Log delivery status
 """
 
+import json
 import logging
-from datetime import date, timedelta
-from typing import Optional
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Union
 
 logger = logging.getLogger(__name__)
 
 ALERT_DAYS_AHEAD = 5
 WEEKEND_DAYS = {"Friday", "Saturday", "Sunday"}
 MAX_STALENESS_HOURS = 48
+SMS_MAX_CHARS = 320
 
+PROMO_ICONS = {
+    "giveaway":  "🎁",
+    "fireworks": "🎆",
+    "discount":  "💰",
+    "theme":     "🎭",
+    "heritage":  "⚾",
+    "special":   "⭐",
+}
+# "icon " prefixes prebuilt so the summary is a plain concat per promo
+_ICON_PREFIX = {k: f"{v} " for k, v in PROMO_ICONS.items()}
+_DEFAULT_PREFIX = "⭐ "
 
-def get_qualifying_games(conn, target_date: date) -> list:
+# "Fri Apr 10" — Windows uses %#d for no leading zero, Unix uses %-d
+_DATE_FMT = "%a %b %#d" if os.name == "nt" else "%a %b %-d"
+
+
+def get_qualifying_games(conn, target_date: Union[date, str]) -> list:
     """
     Return home games on target_date that are Fri/Sat/Sun.
     These are the games that should trigger alerts today
     (sent ALERT_DAYS_AHEAD before the game).
+    Accepts a date or a pre-formatted YYYY-MM-DD string.
     """
-    date_str = target_date.isoformat()
+    date_str = target_date if isinstance(target_date, str) else target_date.isoformat()
+
+    # Cheap probe on the unique game_date index — most days have no
+    # qualifying game, so skip the promotions join/aggregate entirely
+    exists = conn.execute(
+        """SELECT 1 FROM games
+           WHERE game_date = ? AND is_home = 1
+           AND day_of_week IN ('Friday','Saturday','Sunday')
+           LIMIT 1""",
+        (date_str,)
+    ).fetchone()
+    if exists is None:
+        return []
+
     rows = conn.execute(
-        """SELECT g.*, GROUP_CONCAT(p.promo_type || ':' || COALESCE(p.description,''), '||') as promos_raw
+        """SELECT g.*,
+                  json_group_array(json_object(
+                      'promo_type',  p.promo_type,
+                      'description', TRIM(COALESCE(p.description,''), char(32,9,10,13))
+                  )) FILTER (WHERE p.id IS NOT NULL) as promos_json
            FROM games g
            LEFT JOIN promotions p ON p.game_id = g.id
            WHERE g.game_date = ? AND g.is_home = 1
@@ -45,7 +81,7 @@ def build_alert_payload(game_row) -> dict:
     Build a self-contained alert payload from a game row.
     Per FR-14 and FR-15: complete context, no click-through required.
     """
-    promos = _parse_promos(game_row["promos_raw"])
+    promos = json.loads(game_row["promos_json"] or "[]")
 
     if promos:
         promo_summary = _format_promo_summary(promos)
@@ -59,13 +95,8 @@ def build_alert_payload(game_row) -> dict:
     ticket_url = game_row["ticket_url"] or "https://www.milb.com/hartford/tickets"
 
     # Format date nicely e.g. "Fri Apr 10"
-    from datetime import datetime
     try:
-        dt = datetime.strptime(game_date, "%Y-%m-%d")
-        # Windows uses %#d for no leading zero, Unix uses %-d
-        import os
-        fmt = "%a %b %#d" if os.name == 'nt' else "%a %b %-d"
-        display_date = dt.strftime(fmt)
+        display_date = date.fromisoformat(game_date).strftime(_DATE_FMT)
     except ValueError:
         display_date = game_date
 
@@ -89,7 +120,6 @@ def check_data_freshness(conn) -> bool:
     Returns False if stale or absent — alert engine should skip sending.
     Per architecture section 8.2.
     """
-    from datetime import datetime
     row = conn.execute("SELECT MAX(updated_at) as last_update FROM games").fetchone()
     if not row or not row["last_update"]:
         logger.warning("No game data found in database")
@@ -99,7 +129,8 @@ def check_data_freshness(conn) -> bool:
     try:
         # SQLite CURRENT_TIMESTAMP format: "2026-04-10 23:05:00"
         last_update = datetime.strptime(last_update_str[:19], "%Y-%m-%d %H:%M:%S")
-        age_hours = (datetime.utcnow() - last_update).total_seconds() / 3600
+        now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+        age_hours = (now_utc - last_update).total_seconds() / 3600
         if age_hours > MAX_STALENESS_HOURS:
             logger.warning(
                 "Schedule data is stale (%.1f hours old, limit %d h) — skipping alerts",
@@ -117,25 +148,20 @@ def format_sms_message(payload: dict) -> str:
     Format a self-contained SMS alert ≤ 320 chars per NFR-05.
     Pattern per architecture section 3.2.
     """
-    msg = (
+    head = (
         f"🎯 Yard Goats {payload['day']} {payload['display_date']} @ {payload['time']}\n"
         f"vs {payload['opponent']}\n"
-        f"{payload['promo_summary']}\n"
-        f"Tickets: {payload['ticket_url']}\n"
+    )
+    tail = (
+        f"\nTickets: {payload['ticket_url']}\n"
         f"Reply STOP to unsubscribe"
     )
-    if len(msg) > 320:
-        # Truncate promo summary to fit
-        budget = 320 - len(msg) + len(payload['promo_summary'])
-        truncated = payload['promo_summary'][:budget - 3] + "..."
-        msg = (
-            f"🎯 Yard Goats {payload['day']} {payload['display_date']} @ {payload['time']}\n"
-            f"vs {payload['opponent']}\n"
-            f"{truncated}\n"
-            f"Tickets: {payload['ticket_url']}\n"
-            f"Reply STOP to unsubscribe"
-        )
-    return msg
+    summary = payload["promo_summary"]
+    # Truncate promo summary up front so the message is built once
+    budget = SMS_MAX_CHARS - len(head) - len(tail)
+    if len(summary) > budget:
+        summary = summary[:budget - 3] + "..."
+    return head + summary + tail
 
 
 def format_email_subject(payload: dict) -> str:
@@ -159,41 +185,13 @@ def format_email_subject(payload: dict) -> str:
 
 # ── Internal helpers ──────────────────────────────────────
 
-def _parse_promos(promos_raw: Optional[str]) -> list[dict]:
-    """Parse GROUP_CONCAT promo string back into list of dicts."""
-    if not promos_raw:
-        return []
-    promos = []
-    for item in promos_raw.split("||"):
-        if ":" not in item:
-            continue
-        promo_type, _, description = item.partition(":")
-        if promo_type.strip():
-            promos.append({
-                "promo_type":  promo_type.strip(),
-                "description": description.strip(),
-            })
-    return promos
-
-
 def _format_promo_summary(promos: list[dict]) -> str:
     """
     Format promos into a concise, human-readable summary.
     e.g. "🎁 Cowboy Hat Giveaway | 🎆 Post-Game Fireworks"
     """
-    ICONS = {
-        "giveaway":  "🎁",
-        "fireworks": "🎆",
-        "discount":  "💰",
-        "theme":     "🎭",
-        "heritage":  "⚾",
-        "special":   "⭐",
-    }
-    parts = []
-    for p in promos:
-        icon = ICONS.get(p["promo_type"], "⭐")
-        desc = p["description"]
-        if len(desc) > 35:
-            desc = desc[:32] + "..."
-        parts.append(f"{icon} {desc}")
-    return " | ".join(parts)
+    return " | ".join(
+        _ICON_PREFIX.get(p["promo_type"], _DEFAULT_PREFIX)
+        + (p["description"][:32] + "..." if len(p["description"]) > 35 else p["description"])
+        for p in promos
+    )
@@ -9,27 +9,30 @@ Flow:
      a. Check dedup (skip if already alerted)
      b. Send SMS (if recipient has phone)
      c. Send email (if recipient has email)
+        — sends for a game run concurrently in a thread pool
      d. Log delivery status
   4. Commit delivery log (handled by GitHub Actions workflow)
 """
 
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from admin.db import (
-    init_db, get_conn, list_recipients,
-    has_alert_been_sent, log_alert
+    init_db, get_conn, transaction, list_recipients,
+    get_sent_alerts_for_game, log_alerts
 )
 from alerts.engine import (
     get_qualifying_games, build_alert_payload,
     check_data_freshness, format_sms_message, format_email_subject
 )
-from alerts.sms import send_sms
-from alerts.email_sender import send_email
+from alerts.sms import send_sms_bulk
+from alerts.email_sender import send_email, render_alert_html
 
 logging.basicConfig(
     level=logging.INFO,
@@ -38,12 +41,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger("alerts.main")
 
+MAX_SEND_WORKERS = 16
+
 
 def run(
     today:   date   = None,
     dry_run: bool   = False,
     sms_client=None,
     email_client=None,
+    db_path:  Optional[Path] = None,
 ) -> dict:
     """
     Execute the full alert pipeline for a given day.
@@ -53,6 +59,7 @@ def run(
         dry_run:      If True, build payloads but do not send or log
         sms_client:   Injectable Twilio client (for tests)
         email_client: Injectable SendGrid client (for tests)
+        db_path:      DB to use instead of $YARDGOATS_DB / the default (for tests)
 
     Returns:
         Summary dict: { games_checked, alerts_sent, sms_sent,
@@ -62,9 +69,10 @@ def run(
         today = date.today()
 
     target_date = today + timedelta(days=5)
+    date_str    = target_date.isoformat()
     logger.info(
         "Alert run: today=%s, alerting for games on %s (dry_run=%s)",
-        today, target_date, dry_run
+        today, date_str, dry_run
     )
 
     stats = {
@@ -77,20 +85,23 @@ def run(
         "skipped":       0,
     }
 
-    init_db()
+    init_db(db_path)
 
-    with get_conn() as conn:
+    # No write lock while messages are in flight: each game's log batch takes
+    # its own BEGIN IMMEDIATE, so the scraper and admin CLI never wait out
+    # busy_timeout behind throttled sends
+    with get_conn(db_path) as conn:
         # ── Staleness guard ───────────────────────────────
         if not check_data_freshness(conn):
             logger.warning("Stale data — skipping alert run")
             return stats
 
         # ── Find qualifying games ─────────────────────────
-        games = get_qualifying_games(conn, target_date)
+        games = get_qualifying_games(conn, date_str)
         stats["games_checked"] = len(games)
 
         if not games:
-            logger.info("No qualifying games on %s — nothing to send", target_date)
+            logger.info("No qualifying games on %s — nothing to send", date_str)
             return stats
 
         # ── Get active recipients ─────────────────────────
@@ -101,7 +112,7 @@ def run(
 
         logger.info(
             "Found %d game(s) on %s, %d recipient(s)",
-            len(games), target_date, len(recipients)
+            len(games), date_str, len(recipients)
         )
 
         # ── Send alerts ───────────────────────────────────
@@ -109,63 +120,81 @@ def run(
             payload = build_alert_payload(game)
             subject = format_email_subject(payload)
             sms_msg = format_sms_message(payload)
+            html    = render_alert_html(payload)
+            sent    = set() if dry_run else get_sent_alerts_for_game(conn, payload["game_id"])
+            pending_logs = []
 
             logger.info(
                 "Processing: %s vs %s | %s",
                 payload["game_date"], payload["opponent"], payload["promo_summary"][:50]
             )
 
+            # ── Queue sends (dedup on main thread) ────────
+            gid         = payload["game_id"]
+            sms_jobs    = []   # (rid, r_name, phone)
+            email_jobs  = []   # (rid, r_name, kwargs)
             for recipient in recipients:
                 rid     = recipient["id"]
-                gid     = payload["game_id"]
                 r_name  = recipient["name"]
 
-                # ── SMS ───────────────────────────────────
                 if recipient["phone"]:
-                    if not dry_run and has_alert_been_sent(conn, gid, rid, "sms"):
+                    if (rid, "sms") in sent:
                         logger.debug("SMS already sent: game=%d recipient=%d", gid, rid)
                         stats["skipped"] += 1
                     else:
-                        success, detail = send_sms(
-                            to_number=recipient["phone"],
-                            message=sms_msg,
-                            dry_run=dry_run,
-                            client=sms_client,
-                        )
-                        status = "delivered" if success else "failed"
-                        if not dry_run:
-                            log_alert(conn, gid, rid, "sms", status)
-                        if success:
-                            stats["sms_sent"] += 1
-                            stats["alerts_sent"] += 1
-                            logger.info("SMS ✓ → %s", r_name)
-                        else:
-                            stats["sms_failed"] += 1
-                            logger.error("SMS ✗ → %s: %s", r_name, detail)
-
-                # ── Email ─────────────────────────────────
+                        sms_jobs.append((rid, r_name, recipient["phone"]))
+
                 if recipient["email"]:
-                    if not dry_run and has_alert_been_sent(conn, gid, rid, "email"):
+                    if (rid, "email") in sent:
                         logger.debug("Email already sent: game=%d recipient=%d", gid, rid)
                         stats["skipped"] += 1
                     else:
-                        success, detail = send_email(
-                            to_email=recipient["email"],
-                            subject=subject,
-                            payload=payload,
-                            dry_run=dry_run,
-                            client=email_client,
-                        )
-                        status = "delivered" if success else "failed"
-                        if not dry_run:
-                            log_alert(conn, gid, rid, "email", status)
-                        if success:
-                            stats["email_sent"] += 1
-                            stats["alerts_sent"] += 1
-                            logger.info("Email ✓ → %s", r_name)
-                        else:
-                            stats["email_failed"] += 1
-                            logger.error("Email ✗ → %s: %s", r_name, detail)
+                        email_jobs.append((rid, r_name, {
+                            "to_email":  recipient["email"],
+                            "subject":   subject,
+                            "payload":   payload,
+                            "dry_run":   dry_run,
+                            "client":    email_client,
+                            "html_body": html,
+                        }))
+
+            # ── Send concurrently (network-bound) ─────────
+            # Workers only make HTTP calls; the connection stays on this thread.
+            # SMS go through send_sms_bulk, which adapts its own concurrency.
+            with ThreadPoolExecutor(max_workers=MAX_SEND_WORKERS) as pool:
+                sms_future = pool.submit(
+                    send_sms_bulk,
+                    [(phone, sms_msg) for _, _, phone in sms_jobs],
+                    dry_run=dry_run,
+                    client=sms_client,
+                )
+                email_futures = [pool.submit(send_email, **kwargs) for _, _, kwargs in email_jobs]
+
+            outcomes = [
+                ("sms", rid, r_name, result)
+                for (rid, r_name, _), result in zip(sms_jobs, sms_future.result())
+            ] + [
+                ("email", rid, r_name, future.result())
+                for (rid, r_name, _), future in zip(email_jobs, email_futures)
+            ]
+
+            for channel, rid, r_name, (success, detail) in outcomes:
+                label  = "SMS" if channel == "sms" else "Email"
+                status = "delivered" if success else "failed"
+                if not dry_run:
+                    pending_logs.append((gid, rid, channel, status))
+                if success:
+                    stats[f"{channel}_sent"] += 1
+                    stats["alerts_sent"] += 1
+                    logger.info("%s ✓ → %s", label, r_name)
+                else:
+                    stats[f"{channel}_failed"] += 1
+                    logger.error("%s ✗ → %s: %s", label, r_name, detail)
+
+            # ── Log delivery status (one batch per game) ──
+            if pending_logs:
+                with transaction(conn):
+                    log_alerts(conn, pending_logs)
 
     logger.info(
         "Alert run complete — sent=%d sms=%d email=%d failed=%d skipped=%d",
@@ -176,18 +205,23 @@ def run(
 
 
 def main():
-    import argparse
-    parser = argparse.ArgumentParser(description="Yard Goats alert engine")
-    parser.add_argument("--dry-run", action="store_true", help="Send no messages, log only")
-    parser.add_argument("--date",    default=None, help="Override today's date YYYY-MM-DD")
-    args = parser.parse_args()
-
+    argv = sys.argv[1:]
     today = None
-    if args.date:
-        from datetime import datetime
-        today = datetime.strptime(args.date, "%Y-%m-%d").date()
-
-    stats = run(today=today, dry_run=args.dry_run)
+    # Fast path for the scheduled job (no args / --dry-run) — skips argparse
+    if argv in ([], ["--dry-run"]):
+        dry_run = bool(argv)
+    else:
+        import argparse
+        parser = argparse.ArgumentParser(description="Yard Goats alert engine")
+        parser.add_argument("--dry-run", action="store_true", help="Send no messages, log only")
+        parser.add_argument("--date",    default=None, help="Override today's date YYYY-MM-DD")
+        args = parser.parse_args(argv)
+        dry_run = args.dry_run
+        if args.date:
+            from datetime import datetime
+            today = datetime.strptime(args.date, "%Y-%m-%d").date()
+
+    stats = run(today=today, dry_run=dry_run)
 
     total_failed = stats["sms_failed"] + stats["email_failed"]
     sys.exit(1 if total_failed > 0 and stats["alerts_sent"] == 0 else 0)
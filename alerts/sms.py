@@ -2,20 +2,69 @@
 alerts/sms.py — Twilio SMS delivery with retry logic.
 
 Per architecture section 3.2 and reliability design 8.4:
-  - Retry up to 3 times with exponential backoff
+  - Retry up to 3 times with full-jitter exponential backoff,
+    capped at RETRY_MAX_SEC
+  - Pace sends to the long-code rate limit across threads
   - Log delivery status per FR-19
   - Message ≤ 320 chars per NFR-05
 """
 
 import logging
 import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+try:
+    from twilio.rest import Client as _TwilioClient
+except ImportError:
+    _TwilioClient = None
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES    = 3
-RETRY_BASE_SEC = 2   # exponential: 2s, 4s, 8s
+RETRY_BASE_SEC = 2   # backoff cap doubles per attempt: 2s, 4s, … ≤ RETRY_MAX_SEC
+RETRY_MAX_SEC  = 30
+SMS_PER_SEC    = 1   # Twilio long-code throughput limit
+
+BULK_MAX_CONCURRENCY = 8
+
+# Process-wide Twilio client — reuses its HTTPS connection pool across sends
+_CLIENT = None
+_client_lock = threading.Lock()
+
+
+class RateLimiter:
+    """
+    Spaces sends 1/per_sec seconds apart across threads. Each caller
+    reserves the next free slot under the lock and sleeps outside it,
+    so threads wait out their own slot rather than each other's sleeps.
+    """
+
+    def __init__(self, per_sec: float = SMS_PER_SEC):
+        self.interval = 1.0 / per_sec
+        self._lock = threading.Lock()
+        self._next_slot = float("-inf")
+
+    def wait(self) -> None:
+        """Block until this caller's send slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def reset(self) -> None:
+        """Forget past sends, so the next wait() returns immediately."""
+        with self._lock:
+            self._next_slot = float("-inf")
+
+
+# Process-wide pacer for the sending number — patch or pass `pacer` in tests
+_PACER = RateLimiter()
 
 
 def send_sms(
@@ -23,6 +72,7 @@ def send_sms(
     message:   str,
     dry_run:   bool = False,
     client=None,   # injectable Twilio client for testing
+    pacer: Optional[RateLimiter] = None,
 ) -> tuple[bool, str]:
     """
     Send an SMS via Twilio.
@@ -32,28 +82,46 @@ def send_sms(
         message:   Message body (≤ 320 chars)
         dry_run:   If True, log but do not actually send
         client:    Optional pre-built Twilio client (for tests)
+        pacer:     Rate limiter to send through (defaults to the shared one)
 
     Returns:
         (success: bool, status_detail: str)
     """
+    ok, detail, _ = _send_sms(to_number, message, dry_run, client, pacer)
+    return ok, detail
+
+
+def _send_sms(
+    to_number: str,
+    message:   str,
+    dry_run:   bool,
+    client,
+    pacer:     Optional[RateLimiter],
+) -> tuple[bool, str, bool]:
+    """
+    send_sms, plus whether the final failure was provider pushback
+    (HTTP 429 or 5xx on the Twilio error) — send_sms_bulk backs off on it.
+    """
     if len(message) > 320:
         logger.warning("SMS message exceeds 320 chars (%d) — truncating", len(message))
         message = message[:317] + "..."
 
     if dry_run:
         logger.info("[dry-run] SMS to %s: %s", to_number, message[:60] + "...")
-        return True, "dry_run"
+        return True, "dry_run", False
 
     twilio_client = client or _get_twilio_client()
     from_number   = os.environ.get("TWILIO_FROM_NUMBER", "")
+    pacer         = pacer or _PACER
 
     if not from_number:
         logger.error("TWILIO_FROM_NUMBER not set")
-        return False, "missing_config"
+        return False, "missing_config", False
 
-    last_error = ""
+    last_exc: Optional[Exception] = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
+            pacer.wait()
             msg = twilio_client.messages.create(
                 body=message,
                 from_=from_number,
@@ -63,14 +131,14 @@ def send_sms(
                 "SMS sent to %s (sid=%s, status=%s)",
                 _mask(to_number), msg.sid, msg.status
             )
-            return True, msg.status or "sent"
+            return True, msg.status or "sent", False
 
         except Exception as exc:
-            last_error = str(exc)
+            last_exc = exc
             if attempt < MAX_RETRIES:
-                wait = RETRY_BASE_SEC ** attempt
+                wait = _backoff(attempt)
                 logger.warning(
-                    "SMS attempt %d/%d failed for %s: %s — retrying in %ds",
+                    "SMS attempt %d/%d failed for %s: %s — retrying in %.1fs",
                     attempt, MAX_RETRIES, _mask(to_number), exc, wait
                 )
                 time.sleep(wait)
@@ -80,22 +148,78 @@ def send_sms(
                     MAX_RETRIES, _mask(to_number), exc
                 )
 
-    return False, f"failed: {last_error}"
+    return False, f"failed: {last_exc}", _is_pushback(last_exc)
+
+
+def send_sms_bulk(
+    pairs:   list[tuple[str, str]],
+    dry_run: bool = False,
+    client=None,
+    max_concurrency: int = BULK_MAX_CONCURRENCY,
+    pacer: Optional[RateLimiter] = None,
+) -> list[tuple[bool, str]]:
+    """
+    Send many SMS concurrently with AIMD concurrency control.
+
+    Messages go out in waves. After a clean wave the wave size grows by
+    one (additive increase, up to max_concurrency); after a wave with a
+    429/5xx failure it halves (multiplicative decrease, down to 1).
+
+    Every send still goes through the pacer, so at the default long-code
+    SMS_PER_SEC the pacer sets throughput; wider waves pay off when the
+    sender's rate allows more than one send per network round trip.
+
+    Args:
+        pairs: (to_number, message) tuples
+        dry_run, client, pacer: as for send_sms
+
+    Returns:
+        (success, status_detail) per pair, in input order.
+    """
+    results: list[tuple[bool, str]] = []
+    concurrency = 1
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        while len(results) < len(pairs):
+            wave = pairs[len(results):len(results) + concurrency]
+            outcomes = list(pool.map(
+                lambda pair: _send_sms(pair[0], pair[1], dry_run, client, pacer),
+                wave,
+            ))
+            results.extend((ok, detail) for ok, detail, _ in outcomes)
+            if any(pushback for _, _, pushback in outcomes):
+                concurrency = max(1, concurrency // 2)
+            else:
+                concurrency = min(max_concurrency, concurrency + 1)
+    return results
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base·2^(n-1))]."""
+    return random.uniform(0, min(RETRY_MAX_SEC, RETRY_BASE_SEC * 2 ** (attempt - 1)))
+
+
+def _is_pushback(exc: Exception) -> bool:
+    """True for a rate-limit or server error — TwilioRestException.status is the HTTP status."""
+    status = getattr(exc, "status", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
 
 
 def _get_twilio_client():
-    """Build a Twilio client from environment variables."""
-    try:
-        from twilio.rest import Client
-    except ImportError:
-        raise RuntimeError(
-            "twilio package not installed. Run: pip install twilio"
-        )
-    sid   = os.environ.get("TWILIO_ACCOUNT_SID", "")
-    token = os.environ.get("TWILIO_AUTH_TOKEN",  "")
-    if not sid or not token:
-        raise RuntimeError("TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN must be set")
-    return Client(sid, token)
+    """Return the shared Twilio client, building it from env vars on first use."""
+    global _CLIENT
+    with _client_lock:
+        if _CLIENT is not None:
+            return _CLIENT
+        if _TwilioClient is None:
+            raise RuntimeError(
+                "twilio package not installed. Run: pip install twilio"
+            )
+        sid   = os.environ.get("TWILIO_ACCOUNT_SID", "")
+        token = os.environ.get("TWILIO_AUTH_TOKEN",  "")
+        if not sid or not token:
+            raise RuntimeError("TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN must be set")
+        _CLIENT = _TwilioClient(sid, token)
+        return _CLIENT
 
 
 def _mask(phone: str) -> str:
@@ -17,7 +17,12 @@ from pathlib import Path
 # Ensure project root is on path when run directly
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from admin.db import init_db, get_conn, upsert_game, upsert_promotions, get_games_on_date
+from admin.db import init_db, get_conn, transaction, upsert_games_batch, \
+    upsert_promotions_batch, get_games_on_dates
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from scraper.schedule import fetch_schedule
 from scraper.promotions import fetch_promotions
 
@@ -29,6 +34,27 @@ logging.basicConfig(
 logger = logging.getLogger("scraper.main")
 
 
+def build_session() -> requests.Session:
+    """
+    One pooled keep-alive session shared by the schedule and promotions
+    fetchers, with transient HTTP failures retried by urllib3.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def run(season: int = None, dry_run: bool = False) -> bool:
     """
     Execute the full scrape pipeline.
@@ -49,9 +75,11 @@ def run(season: int = None, dry_run: bool = False) -> bool:
     if not dry_run:
         init_db()
 
+    session = build_session()
+
     # ── Step 2: Fetch schedule ────────────────────────────
     try:
-        games = fetch_schedule(season=season)
+        games = fetch_schedule(season=season, session=session)
         logger.info("Fetched %d home games from MLB Stats API", len(games))
     except Exception as exc:
         logger.error("Schedule fetch failed: %s", exc)
@@ -63,9 +91,8 @@ def run(season: int = None, dry_run: bool = False) -> bool:
 
     # ── Step 3: Upsert games ──────────────────────────────
     if not dry_run:
-        with get_conn() as conn:
-            for game in games:
-                upsert_game(conn, game)
+        with get_conn() as conn, transaction(conn):
+            upsert_games_batch(conn, games)
         logger.info("Upserted %d games to database", len(games))
     else:
         for g in games[:3]:
@@ -73,7 +100,7 @@ def run(season: int = None, dry_run: bool = False) -> bool:
 
     # ── Step 4: Fetch promotions ──────────────────────────
     try:
-        promo_map = fetch_promotions()
+        promo_map = fetch_promotions(session=session)
         logger.info("Fetched promotions for %d game dates", len(promo_map))
     except Exception as exc:
         # Promotions failure is non-fatal — games still get alerts
@@ -82,14 +109,13 @@ def run(season: int = None, dry_run: bool = False) -> bool:
 
     # ── Step 5: Upsert promotions ─────────────────────────
     if not dry_run and promo_map:
-        with get_conn() as conn:
-            matched = 0
-            for game_date_str, promos in promo_map.items():
-                rows = get_games_on_date(conn, game_date_str)
-                for row in rows:
-                    upsert_promotions(conn, row["id"], promos)
-                    matched += 1
-            logger.info("Matched promotions to %d games", matched)
+        with get_conn() as conn, transaction(conn):
+            promos_by_game = {
+                row["id"]: promo_map[row["game_date"]]
+                for row in get_games_on_dates(conn, list(promo_map))
+            }
+            upsert_promotions_batch(conn, promos_by_game)
+            logger.info("Matched promotions to %d games", len(promos_by_game))
 
     logger.info("Scrape complete ✓")
     return True
@@ -13,13 +13,25 @@ as new event types emerge during the season.
 import logging
 import re
 from datetime import date, datetime
-from typing import Optional
+from io import BytesIO
+from functools import lru_cache
+from typing import Optional, Union
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from lxml import etree  # C parser: streamed row reads + BeautifulSoup backend
+    BS4_PARSER = "lxml"
+except ImportError:
+    etree = None
+    BS4_PARSER = "html.parser"
 
 logger = logging.getLogger(__name__)
 
+# Only <tr> subtrees are read — skip building nav/footer/script nodes
+_ROWS_ONLY = SoupStrainer("tr")
+
 PROMOS_URL = "https://www.milb.com/hartford/tickets/promotions"
 
 DEFAULT_HEADERS = {
@@ -31,23 +43,57 @@ DEFAULT_HEADERS = {
 }
 
 # ── Keyword → promo_type mapping (order matters — first match wins) ──
-PROMO_RULES: list[tuple[list[str], str]] = [
-    (["giveaway", "give away", "hat", "shirt", "jersey", "bobblehead",
-      "tote", "bag", "paddle", "crocs", "fanny pack", "cowboy"],   "giveaway"),
-    (["fireworks", "firework"],                                      "fireworks"),
-    (["dollar", "$1", "discount", "deal", "buck", "cheap",
-      "happy hour", "value"],                                        "discount"),
-    (["negro league", "whalers", "alumni", "heritage"],              "heritage"),
-    (["star wars", "pajama", "country", "90s", "unicorn",
+PROMO_RULES: tuple[tuple[tuple[str, ...], str], ...] = (
+    (("giveaway", "give away", "hat", "shirt", "jersey", "bobblehead",
+      "tote", "bag", "paddle", "crocs", "fanny pack", "cowboy"),   "giveaway"),
+    (("fireworks", "firework"),                                      "fireworks"),
+    (("dollar", "$1", "discount", "deal", "buck", "cheap",
+      "happy hour", "value"),                                        "discount"),
+    (("negro league", "whalers", "alumni", "heritage"),              "heritage"),
+    (("star wars", "pajama", "country", "90s", "unicorn",
       "night", "theme", "celebration", "pride",
-      "jersey retirement", "boy band"],                              "theme"),
+      "jersey retirement", "boy band"),                              "theme"),
+)
+
+# ── Precompiled patterns ──────────────────────────────────
+_WS_RE = re.compile(r"\s+")
+_DIGIT_RE = re.compile(r"\d")
+
+# One lookahead per rule, tried in PROMO_RULES order, so rule priority
+# (not position in the text) decides the type — same as a keyword scan
+_CLASSIFY_RE = re.compile(
+    "(?:" + "|".join(
+        f"(?=.*?(?P<{promo_type}>{'|'.join(map(re.escape, keywords))}))"
+        for keywords, promo_type in PROMO_RULES
+    ) + ")",
+    re.IGNORECASE | re.DOTALL,
+)
+
+_DATE_PATTERNS: list[tuple[re.Pattern, str]] = [
+    (re.compile(pattern, re.IGNORECASE), fmt) for pattern, fmt in [
+        # "April 10, 2026" or "Friday, April 10, 2026"
+        (r"(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s*"
+         r"(\w+ \d{1,2},?\s*\d{4})",
+         "%B %d, %Y"),
+        # "Apr 10, 2026"
+        (r"(\w{3} \d{1,2},?\s*\d{4})", "%b %d, %Y"),
+        # "April 10" (no year — assume upcoming season)
+        (r"(\w+ \d{1,2})(?!\s*,?\s*\d{4})", "%B %d"),
+        # "04/10/2026"
+        (r"(\d{1,2}/\d{1,2}/\d{4})", "%m/%d/%Y"),
+        # "2026-04-10"
+        (r"(\d{4}-\d{2}-\d{2})", "%Y-%m-%d"),
+    ]
 ]
 
 # ── Public API ────────────────────────────────────────────
 
 def fetch_promotions(
-    html: Optional[str] = None,
+    html: Optional[Union[str, bytes]] = None,
     session: Optional[requests.Session] = None,
+    *,
+    tree=None,
+    encoding: Optional[str] = None,
 ) -> dict[str, list[dict]]:
     """
     Scrape the promotions page.
@@ -55,69 +101,120 @@ def fetch_promotions(
     Returns dict keyed by game_date (YYYY-MM-DD) → list of promo dicts:
         { promo_type: str, description: str }
 
-    Pass `html` directly to bypass HTTP (used in tests).
+    Pass `html` (str or bytes) directly to bypass HTTP (used in tests),
+    or `tree`, an already-parsed lxml document, to skip parsing as well.
+    `encoding` is the charset of bytes `html` when known (e.g. from HTTP
+    headers); without it the parser goes by the page's <meta charset>.
     """
+    if tree is not None:
+        return _rows_to_promos(_iter_rows_tree(tree))
+
     if html is None:
-        html = _fetch_html(session)
+        html, encoding = _fetch_html(session)
+
+    if etree is not None:
+        return _rows_to_promos(_iter_rows_lxml(html, encoding))
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(
+        html, BS4_PARSER, parse_only=_ROWS_ONLY,
+        from_encoding=encoding if isinstance(html, bytes) else None,
+    )
     result = _parse_promotions(soup)
     return result if result is not None else {}
 
 
+@lru_cache(maxsize=4096)
 def classify_promo(description: str) -> str:
     """
     Classify a promotion description string into a promo_type.
     Falls back to 'special' if no keyword matches.
     """
-    text = description.lower()
-    for keywords, promo_type in PROMO_RULES:
-        if any(kw in text for kw in keywords):
-            return promo_type
-    return "special"
+    match = _CLASSIFY_RE.match(description)
+    return match.lastgroup if match else "special"
 
 
 # ── Internal ──────────────────────────────────────────────
 
-def _fetch_html(session: Optional[requests.Session] = None) -> str:
+def _fetch_html(session: Optional[requests.Session] = None) -> tuple[bytes, Optional[str]]:
+    """Raw page body plus the Content-Type charset, or None if the header has none."""
     sess = session or requests.Session()
     sess.headers.update(DEFAULT_HEADERS)
     try:
         resp = sess.get(PROMOS_URL, timeout=20)
         resp.raise_for_status()
-        return resp.text
+        # requests defaults text/html to Latin-1 when the header has no
+        # charset, so only trust resp.encoding if the server sent one —
+        # otherwise the parser reads the page's own <meta charset>
+        if "charset" in resp.headers.get("Content-Type", "").lower():
+            return resp.content, resp.encoding
+        return resp.content, None
     except requests.RequestException as exc:
         logger.error("Failed to fetch promotions page: %s", exc)
         raise
 
 
-def _parse_promotions(soup: BeautifulSoup) -> dict[str, list[dict]]:
+def _iter_rows_lxml(html: Union[str, bytes], encoding: Optional[str] = None):
     """
-    Parse the promotions page HTML.
+    Stream (date_text, desc_text) from each <tr> with lxml.etree.iterparse,
+    clearing every row once read so the page is never held as a full tree.
     """
+    if isinstance(html, str):
+        # Say what the bytes are — lxml would otherwise assume Latin-1
+        html, encoding = html.encode("utf-8"), "utf-8"
+    try:
+        for _, row in etree.iterparse(
+            BytesIO(html), events=("end",), tag="tr", html=True, recover=True,
+            encoding=encoding,
+        ):
+            cols = row.findall("td")
+            if len(cols) >= 2:
+                yield "".join(cols[0].itertext()).strip(), "".join(cols[1].itertext()).strip()
+            row.clear()
+    except etree.XMLSyntaxError:
+        # Empty or unparseable document — no rows
+        return
+
+
+def _iter_rows_tree(tree):
+    """(date_text, desc_text) from each <tr> of an already-parsed lxml tree."""
+    for row in tree.iter("tr"):
+        cols = row.findall("td")
+        if len(cols) >= 2:
+            yield "".join(cols[0].itertext()).strip(), "".join(cols[1].itertext()).strip()
+
+
+def _rows_to_promos(rows) -> dict[str, list[dict]]:
+    """Group (date_text, desc_text) table rows into the promo map."""
     result: dict[str, list[dict]] = {}
+    for date_text, desc_text in rows:
+        game_date = _parse_date_from_text(date_text)
+        if game_date:
+            if game_date not in result:
+                result[game_date] = []
+
+            # Split multiple promos in one description
+            descriptions = [d.strip() for d in desc_text.split("&")]
+            for d in descriptions:
+                result[game_date].append({
+                    "promo_type": classify_promo(d),
+                    "description": d
+                })
+    return result
 
+
+def _parse_promotions(soup: BeautifulSoup) -> dict[str, list[dict]]:
+    """
+    Parse the promotions page HTML (BeautifulSoup path, used without lxml).
+    """
     # Check for table rows (common in both real site and our test fixture)
     rows = soup.find_all("tr")
     if rows:
-        for row in rows:
-            cols = row.find_all("td")
-            if len(cols) >= 2:
-                date_text = cols[0].get_text(strip=True)
-                desc_text = cols[1].get_text(strip=True)
-                
-                game_date = _parse_date_from_text(date_text)
-                if game_date:
-                    if game_date not in result:
-                        result[game_date] = []
-                    
-                    # Split multiple promos in one description
-                    descriptions = [d.strip() for d in desc_text.split("&")]
-                    for d in descriptions:
-                        result[game_date].append({
-                            "promo_type": classify_promo(d),
-                            "description": d
-                        })
+        # Only the date and description cells are read
+        cells = (row.find_all("td", limit=2) for row in rows)
+        result = _rows_to_promos(
+            (cols[0].get_text(strip=True), cols[1].get_text(strip=True))
+            for cols in cells if len(cols) >= 2
+        )
         if result:
             return result
 
@@ -140,28 +237,23 @@ def _parse_date_from_text(text: str) -> Optional[str]:
       "04/10/2026"
       "04/10/26"
     """
-    current_year = datetime.now().year
-    patterns = [
-        # "April 10, 2026" or "Friday, April 10, 2026"
-        (r"(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s*"
-         r"(\w+ \d{1,2},?\s*\d{4})",
-         "%B %d, %Y"),
-        # "Apr 10, 2026"
-        (r"(\w{3} \d{1,2},?\s*\d{4})", "%b %d, %Y"),
-        # "April 10" (no year — assume upcoming season)
-        (r"(\w+ \d{1,2})(?!\s*,?\s*\d{4})", "%B %d"),
-        # "04/10/2026"
-        (r"(\d{1,2}/\d{1,2}/\d{4})", "%m/%d/%Y"),
-        # "2026-04-10"
-        (r"(\d{4}-\d{2}-\d{2})", "%Y-%m-%d"),
-    ]
-
-    for pattern, fmt in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    # Year is part of the cache key — a long-lived process must not keep
+    # serving last year's date for year-less text after Jan 1
+    return _parse_date_for_year(text, datetime.now().year)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_for_year(text: str, current_year: int) -> Optional[str]:
+    """_parse_date_from_text, with `current_year` filled in for year-less dates."""
+    # Every supported pattern has a digit — skip the regex chain otherwise
+    if not _DIGIT_RE.search(text):
+        return None
+    for pattern, fmt in _DATE_PATTERNS:
+        match = pattern.search(text)
         if match:
             raw = match.group(1).strip().rstrip(",")
             # Normalize spaces
-            raw = re.sub(r"\s+", " ", raw)
+            raw = _WS_RE.sub(" ", raw)
             try:
                 if "%Y" not in fmt:
                     # No year in format — append current season year
@@ -185,11 +277,11 @@ def _extract_promos_from_element(element) -> list[dict]:
     )
     for candidate in candidates:
         text = candidate.get_text(" ", strip=True)
-        text = re.sub(r"\s+", " ", text).strip()
-        if len(text) < 4 or len(text) > 200:
+        text = _WS_RE.sub(" ", text).strip()
+        if not 4 <= len(text) <= 200:
             continue
-        # Skip pure date strings
-        if _parse_date_from_text(text) and len(text) < 20:
+        # Skip pure date strings — only short text can be one, so check length first
+        if len(text) < 20 and _parse_date_from_text(text):
             continue
         promo_type = classify_promo(text)
         promos.append({"promo_type": promo_type, "description": text})
@@ -209,7 +301,7 @@ def _parse_by_text_scan(soup: BeautifulSoup) -> dict[str, list[dict]]:
         if element.find(["h1","h2","h3","h4","h5"]):
             continue
         text = element.get_text(" ", strip=True)
-        text = re.sub(r"\s+", " ", text).strip()
+        text = _WS_RE.sub(" ", text).strip()
         if not text or len(text) > 250:
             continue
 
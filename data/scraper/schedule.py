@@ -13,10 +13,16 @@ API endpoint:
 
 import logging
 from datetime import date, timedelta
+from functools import lru_cache
 from typing import Optional
 
 import requests
 
+try:
+    import orjson  # SIMD JSON decoder — parses the raw response bytes
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # ── Constants ─────────────────────────────────────────────
@@ -70,8 +76,8 @@ def fetch_schedule(
     try:
         resp = sess.get(f"{BASE_URL}/schedule", params=params, timeout=15)
         resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as exc:
+        data = orjson.loads(resp.content) if orjson is not None else resp.json()
+    except (requests.RequestException, ValueError) as exc:
         logger.error("MLB Stats API request failed: %s", exc)
         raise
 
@@ -124,8 +130,7 @@ def _parse_game(game: dict) -> Optional[dict]:
             logger.warning("Could not parse game date: %s", game_dt_str)
             return None
 
-        game_date = date.fromisoformat(game_date_str)
-        dow = DAYS[game_date.weekday()]
+        dow = _day_of_week(game_date_str)
 
         return {
             "game_date":   game_date_str,
@@ -140,6 +145,12 @@ def _parse_game(game: dict) -> Optional[dict]:
         return None
 
 
+@lru_cache(maxsize=256)
+def _day_of_week(date_str: str) -> str:
+    """Weekday name for a YYYY-MM-DD string, e.g. "Friday"."""
+    return DAYS[date.fromisoformat(date_str).weekday()]
+
+
 def _parse_datetime(dt_str: str) -> tuple[str, str]:
     """
     Parse ISO UTC datetime string into (YYYY-MM-DD, "H:MM PM") ET.
@@ -150,10 +161,11 @@ def _parse_datetime(dt_str: str) -> tuple[str, str]:
     if not dt_str:
         return "", ""
     try:
-        # "2026-04-10T23:05:00Z"
-        date_part, time_part = dt_str.rstrip("Z").split("T")
+        # Fixed-width "2026-04-10T23:05:00Z" — slice instead of splitting
+        date_part = dt_str[:10]
+        hour_utc  = int(dt_str[11:13])
+        minute    = int(dt_str[14:16])
         # Convert UTC to ET (EDT = UTC-4 during baseball season)
-        hour_utc, minute, *_ = [int(x) for x in time_part.split(":")]
         hour_et = (hour_utc - 4) % 24
         period  = "PM" if hour_et >= 12 else "AM"
         hour_12 = hour_et % 12 or 12
@@ -0,0 +1,111 @@
+"""
+tests/_dbutil.py — DB setup helpers shared by the test modules.
+
+Two kinds of test DB:
+  - make_tmp_db():    a file DB in its own temp dir, for tests that need
+                      real on-disk behaviour (WAL, init_db reruns)
+  - make_memory_db(): the shared ":memory:" connection, loaded with a page
+                      copy of a schema template built once per process
+"""
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from admin.db import SCHEMA_PATH, init_db, get_conn, close_db
+
+# ":memory:" as a path — get_conn() keeps one in-memory DB per process, so
+# code handed db_path=MEMORY_DB sees the same DB as the test
+MEMORY_DB = Path(":memory:")
+_TEMPLATE = None
+
+_CLEAR_TABLES_SQL = """
+    DELETE FROM alerts_sent;
+    DELETE FROM promotions;
+    DELETE FROM recipients;
+    DELETE FROM games;
+    DELETE FROM sqlite_sequence;
+"""
+
+_SEED_GAME_SQL = """
+    INSERT INTO games (game_date, day_of_week, start_time, opponent, is_home, ticket_url)
+    VALUES (:game_date, :day_of_week, :start_time, :opponent, :is_home, :ticket_url)
+"""
+_SEED_RECIPIENT_SQL = "INSERT INTO recipients (name, phone, email) VALUES (:name, :phone, :email)"
+
+
+def make_tmp_db():
+    """Create a fresh DB in its own temp dir and return its path."""
+    path = Path(tempfile.mkdtemp(prefix="yardgoats-test-")) / "test.db"
+    init_db(path)
+    tune_for_tests(path)
+    return path
+
+
+def tune_for_tests(path):
+    """
+    Test-only: drop fsyncs on the shared connection for a disposable DB.
+    Journal mode stays WAL (production behaviour under test) and locking
+    stays NORMAL because init_db reruns open a second connection.
+    """
+    with get_conn(path) as conn:
+        conn.execute("PRAGMA synchronous = OFF")
+
+
+def teardown_tmp_db(path):
+    close_db()
+    # One rmtree also takes any -wal/-shm side files with it. The connection
+    # is closed above, so a failure here is a real leak — let it surface.
+    shutil.rmtree(path.parent)
+
+
+def _schema_template() -> sqlite3.Connection:
+    """Empty schema, built once per process."""
+    global _TEMPLATE
+    if _TEMPLATE is None:
+        _TEMPLATE = sqlite3.connect(":memory:")
+        _TEMPLATE.executescript(SCHEMA_PATH.read_text())
+    return _TEMPLATE
+
+
+def make_seeded_template(games=(), recipients=()) -> sqlite3.Connection:
+    """
+    Schema template plus fixture rows, for a class to build in setUpClass.
+    Rows go in with one executemany per table inside a single transaction.
+    """
+    template = sqlite3.connect(":memory:")
+    _schema_template().backup(template)
+    with template:
+        template.executemany(_SEED_GAME_SQL, games)
+        template.executemany(_SEED_RECIPIENT_SQL, recipients)
+    return template
+
+
+def make_memory_db(template=None):
+    """
+    Load a fresh copy of the schema into the shared in-memory connection.
+    The schema is built once; each caller gets a page copy via
+    Connection.backup() instead of a temp file + init_db.
+    """
+    with get_conn(MEMORY_DB) as conn:
+        (template or _schema_template()).backup(conn)
+    return MEMORY_DB
+
+
+def teardown_memory_db():
+    # Closing the shared connection discards the in-memory DB
+    close_db()
+
+
+def close_template():
+    """Close the schema template, so no connection outlives the test run."""
+    global _TEMPLATE
+    if _TEMPLATE is not None:
+        _TEMPLATE.close()
+        _TEMPLATE = None
+
+
+def clear_tables(path):
+    """Empty every table (children first) so a class-scoped DB is clean per test."""
+    with get_conn(path) as conn:
+        conn.executescript(_CLEAR_TABLES_SQL)
@@ -6,32 +6,36 @@ Run: python tests/run_tests.py
 """
 import os
 import sys
-import tempfile
 import unittest
+from argparse import Namespace
 import sqlite3
 from pathlib import Path
 from unittest.mock import patch
+from contextlib import redirect_stdout
 from io import StringIO
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+ROOT = str(Path(__file__).parent.parent)
+if ROOT not in sys.path:  # no pyproject/editable install — add the repo root once
+    sys.path.insert(0, ROOT)
 
+from admin.db import (
+    init_db, get_conn, transaction,
+    upsert_game, upsert_games_batch, get_games_on_date, get_games_on_dates,
+    get_weekend_games_on_date, get_data_freshness,
+    upsert_promotions, upsert_promotions_batch, get_promotions_for_game,
+    add_recipient, list_recipients, deactivate_recipient, reactivate_recipient,
+    log_alert, log_alerts, has_alert_been_sent, get_sent_alerts_for_game, get_alert_log,
+)
+from admin.manage import main as manage_main, cmd_add, cmd_list, cmd_remove, cmd_restore, cmd_status
+from _dbutil import (
+    MEMORY_DB, make_tmp_db, teardown_tmp_db, make_memory_db, teardown_memory_db,
+    make_seeded_template, clear_tables,
+)
 
-def make_tmp_db():
-    """Create a fresh temp DB, set env var, return path."""
-    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
-    tmp.close()
-    os.environ["YARDGOATS_DB"] = tmp.name
-    from admin.db import init_db
-    init_db(Path(tmp.name))
-    return Path(tmp.name)
 
-
-def teardown_tmp_db(path):
-    del os.environ["YARDGOATS_DB"]
-    try:
-        path.unlink()
-    except Exception:
-        pass
+# One parameterised statement text, so the shared connection's statement
+# cache serves every schema lookup instead of preparing a literal per test
+_SCHEMA_NAMES_SQL = "SELECT name FROM sqlite_master WHERE type=?"
 
 
 SAMPLE_GAME = {
@@ -48,39 +52,88 @@ SAMPLE_GAME = {
 # SCHEMA TESTS
 # ══════════════════════════════════════════════════════════
 class TestSchemaInit(unittest.TestCase):
-    def setUp(self):
-        self.db_path = make_tmp_db()
-        from admin.db import get_conn
-        self._get_conn = get_conn
+    @classmethod
+    def setUpClass(cls):
+        cls.db_path = make_tmp_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_tmp_db(cls.db_path)
 
     def tearDown(self):
-        teardown_tmp_db(self.db_path)
+        clear_tables(self.db_path)
 
     def test_all_tables_created(self):
-        with self._get_conn(self.db_path) as conn:
-            tables = {r[0] for r in conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
-            ).fetchall()}
+        with get_conn(self.db_path) as conn:
+            tables = {r[0] for r in conn.execute(_SCHEMA_NAMES_SQL, ("table",))}
         self.assertIn("games", tables)
         self.assertIn("promotions", tables)
         self.assertIn("recipients", tables)
         self.assertIn("alerts_sent", tables)
 
     def test_indexes_created(self):
-        with self._get_conn(self.db_path) as conn:
-            indexes = {r[0] for r in conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='index'"
-            ).fetchall()}
+        with get_conn(self.db_path) as conn:
+            indexes = {r[0] for r in conn.execute(_SCHEMA_NAMES_SQL, ("index",))}
         self.assertIn("idx_games_date", indexes)
         self.assertIn("idx_games_dow", indexes)
 
+    def test_alert_dedup_probe_uses_index(self):
+        with get_conn(self.db_path) as conn:
+            plan = " ".join(r[3] for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT 1 FROM alerts_sent "
+                "WHERE game_id=? AND recipient_id=? AND channel=?", (1, 1, "sms")
+            ).fetchall())
+        self.assertIn("USING COVERING INDEX", plan)
+
     def test_init_is_idempotent(self):
-        from admin.db import init_db
-        init_db(self.db_path)
-        init_db(self.db_path)  # should not raise
+        # setUpClass already ran init_db — a rerun must not touch the schema
+        with get_conn(self.db_path) as conn:
+            before = conn.execute("PRAGMA schema_version").fetchone()[0]
+            init_db(self.db_path)  # should not raise
+            after = conn.execute("PRAGMA schema_version").fetchone()[0]
+        self.assertEqual(before, after)
+
+    def test_write_conn_begins_immediate_transaction(self):
+        with get_conn(self.db_path, write=True) as conn:
+            self.assertTrue(conn.in_transaction)
+        with get_conn(self.db_path) as conn:
+            self.assertFalse(conn.in_transaction)
+
+    def test_nested_get_conn_joins_outer_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with get_conn(self.db_path, write=True) as conn:
+                with get_conn(self.db_path):
+                    upsert_game(conn, SAMPLE_GAME)
+                # The inner exit must not have committed the outer write
+                self.assertTrue(conn.in_transaction)
+                raise RuntimeError("boom")
+        with get_conn(self.db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        self.assertEqual(count, 0)
+
+    def test_other_path_leaves_connection_open(self):
+        with get_conn(self.db_path) as conn:
+            with get_conn(MEMORY_DB) as other:
+                self.assertIsNot(conn, other)
+            # Still usable — opening another DB didn't close it
+            conn.execute("SELECT 1").fetchone()
+
+    def test_transaction_rolls_back_on_error(self):
+        with get_conn(self.db_path) as conn:
+            with self.assertRaises(RuntimeError):
+                with transaction(conn):
+                    upsert_game(conn, SAMPLE_GAME)
+                    raise RuntimeError("boom")
+            count = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        self.assertEqual(count, 0)
+
+    def test_connection_pragmas(self):
+        with get_conn(self.db_path) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
 
     def test_foreign_keys_enabled(self):
-        with self._get_conn(self.db_path) as conn:
+        with get_conn(self.db_path) as conn:
             result = conn.execute("PRAGMA foreign_keys").fetchone()[0]
         self.assertEqual(result, 1)
 
@@ -89,83 +142,102 @@ class TestSchemaInit(unittest.TestCase):
 # GAME HELPER TESTS
 # ══════════════════════════════════════════════════════════
 class TestGameHelpers(unittest.TestCase):
-    def setUp(self):
-        self.db_path = make_tmp_db()
-        from admin.db import get_conn, upsert_game, get_games_on_date, \
-            get_weekend_games_on_date, get_data_freshness
-        self.get_conn = get_conn
-        self.upsert_game = upsert_game
-        self.get_games_on_date = get_games_on_date
-        self.get_weekend_games_on_date = get_weekend_games_on_date
-        self.get_data_freshness = get_data_freshness
+    @classmethod
+    def setUpClass(cls):
+        # One in-memory DB for the class, truncated after each test
+        cls.db_path = make_memory_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_memory_db()
 
     def tearDown(self):
-        teardown_tmp_db(self.db_path)
+        clear_tables(self.db_path)
 
     def test_upsert_inserts_new_game(self):
-        with self.get_conn(self.db_path) as conn:
-            gid = self.upsert_game(conn, SAMPLE_GAME)
+        with get_conn(self.db_path) as conn:
+            gid = upsert_game(conn, SAMPLE_GAME)
         self.assertIsInstance(gid, int)
         self.assertGreater(gid, 0)
 
     def test_upsert_updates_existing_game(self):
-        with self.get_conn(self.db_path) as conn:
-            gid1 = self.upsert_game(conn, SAMPLE_GAME)
+        with get_conn(self.db_path) as conn:
+            gid1 = upsert_game(conn, SAMPLE_GAME)
             updated = {**SAMPLE_GAME, "opponent": "New Hampshire Fisher Cats"}
-            gid2 = self.upsert_game(conn, updated)
+            gid2 = upsert_game(conn, updated)
             self.assertEqual(gid1, gid2)
             row = conn.execute("SELECT opponent FROM games WHERE id=?", (gid1,)).fetchone()
         self.assertEqual(row["opponent"], "New Hampshire Fisher Cats")
 
+    def test_upsert_games_batch(self):
+        sat = {**SAMPLE_GAME, "game_date": "2026-04-11", "day_of_week": "Saturday"}
+        with get_conn(self.db_path) as conn:
+            upsert_game(conn, SAMPLE_GAME)
+            upsert_games_batch(conn, [{**SAMPLE_GAME, "opponent": "Fisher Cats"}, sat])
+            rows = conn.execute("SELECT game_date, opponent FROM games ORDER BY game_date").fetchall()
+        self.assertEqual([tuple(r) for r in rows],
+                         [("2026-04-10", "Fisher Cats"), ("2026-04-11", "Portland Sea Dogs")])
+
     def test_get_games_on_date_home_only(self):
-        with self.get_conn(self.db_path) as conn:
-            self.upsert_game(conn, SAMPLE_GAME)
-            results = self.get_games_on_date(conn, "2026-04-10")
+        with get_conn(self.db_path) as conn:
+            upsert_game(conn, SAMPLE_GAME)
+            results = get_games_on_date(conn, "2026-04-10")
         self.assertEqual(len(results), 1)
 
+    def test_get_games_on_dates_single_query(self):
+        sat  = {**SAMPLE_GAME, "game_date": "2026-04-11", "day_of_week": "Saturday"}
+        away = {**SAMPLE_GAME, "game_date": "2026-04-12", "is_home": 0}
+        with get_conn(self.db_path) as conn:
+            for g in (SAMPLE_GAME, sat, away):
+                upsert_game(conn, g)
+            rows = get_games_on_dates(conn, ["2026-04-10", "2026-04-11", "2026-04-12"])
+            empty = get_games_on_dates(conn, [])
+        self.assertEqual(sorted(r["game_date"] for r in rows), ["2026-04-10", "2026-04-11"])
+        self.assertEqual(empty, [])
+
     def test_get_games_excludes_away(self):
         away = {**SAMPLE_GAME, "game_date": "2026-04-11", "is_home": 0}
-        with self.get_conn(self.db_path) as conn:
-            self.upsert_game(conn, away)
-            results = self.get_games_on_date(conn, "2026-04-11")
+        with get_conn(self.db_path) as conn:
+            upsert_game(conn, away)
+            results = get_games_on_date(conn, "2026-04-11")
         self.assertEqual(len(results), 0)
 
     def test_weekend_includes_friday(self):
-        with self.get_conn(self.db_path) as conn:
-            self.upsert_game(conn, SAMPLE_GAME)
-            results = self.get_weekend_games_on_date(conn, "2026-04-10")
+        with get_conn(self.db_path) as conn:
+            upsert_game(conn, SAMPLE_GAME)
+            results = get_weekend_games_on_date(conn, "2026-04-10")
         self.assertEqual(len(results), 1)
 
     def test_weekend_includes_saturday(self):
         sat = {**SAMPLE_GAME, "game_date": "2026-04-11", "day_of_week": "Saturday"}
-        with self.get_conn(self.db_path) as conn:
-            self.upsert_game(conn, sat)
-            results = self.get_weekend_games_on_date(conn, "2026-04-11")
+        with get_conn(self.db_path) as conn:
+            upsert_game(conn, sat)
+            results = get_weekend_games_on_date(conn, "2026-04-11")
         self.assertEqual(len(results), 1)
 
     def test_weekend_includes_sunday(self):
         sun = {**SAMPLE_GAME, "game_date": "2026-04-12", "day_of_week": "Sunday"}
-        with self.get_conn(self.db_path) as conn:
-            self.upsert_game(conn, sun)
-            results = self.get_weekend_games_on_date(conn, "2026-04-12")
+        with get_conn(self.db_path) as conn:
+            upsert_game(conn, sun)
+            results = get_weekend_games_on_date(conn, "2026-04-12")
         self.assertEqual(len(results), 1)
 
     def test_weekend_excludes_wednesday(self):
         wed = {**SAMPLE_GAME, "game_date": "2026-04-08", "day_of_week": "Wednesday"}
-        with self.get_conn(self.db_path) as conn:
-            self.upsert_game(conn, wed)
-            results = self.get_weekend_games_on_date(conn, "2026-04-08")
+        with get_conn(self.db_path) as conn:
+            upsert_game(conn, wed)
+            results = get_weekend_games_on_date(conn, "2026-04-08")
         self.assertEqual(len(results), 0)
 
     def test_data_freshness_none_when_empty(self):
-        with self.get_conn(self.db_path) as conn:
-            ts = self.get_data_freshness(conn)
+        with get_conn(self.db_path) as conn:
+            ts = get_data_freshness(conn)
         self.assertIsNone(ts)
 
     def test_data_freshness_after_insert(self):
-        with self.get_conn(self.db_path) as conn:
-            self.upsert_game(conn, SAMPLE_GAME)
-            ts = self.get_data_freshness(conn)
+        with get_conn(self.db_path) as conn:
+            upsert_game(conn, SAMPLE_GAME)
+            ts = get_data_freshness(conn)
         self.assertIsNotNone(ts)
 
 
@@ -173,54 +245,66 @@ class TestGameHelpers(unittest.TestCase):
 # PROMOTION TESTS
 # ══════════════════════════════════════════════════════════
 class TestPromotionHelpers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.template = make_seeded_template(games=[SAMPLE_GAME])
+        cls.gid = cls.template.execute("SELECT id FROM games").fetchone()[0]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.template.close()
+
     def setUp(self):
-        self.db_path = make_tmp_db()
-        from admin.db import get_conn, upsert_game, upsert_promotions, get_promotions_for_game
-        self.get_conn = get_conn
-        self.upsert_game = upsert_game
-        self.upsert_promotions = upsert_promotions
-        self.get_promotions_for_game = get_promotions_for_game
-        with self.get_conn(self.db_path) as conn:
-            self.gid = self.upsert_game(conn, SAMPLE_GAME)
+        self.db_path = make_memory_db(self.template)
 
     def tearDown(self):
-        teardown_tmp_db(self.db_path)
+        teardown_memory_db()
 
     def test_insert_two_promos(self):
-        with self.get_conn(self.db_path) as conn:
-            self.upsert_promotions(conn, self.gid, [
+        with get_conn(self.db_path) as conn:
+            upsert_promotions(conn, self.gid, [
                 {"promo_type": "giveaway",  "description": "Paddle"},
                 {"promo_type": "fireworks", "description": "Post-game"},
             ])
-            promos = self.get_promotions_for_game(conn, self.gid)
+            promos = get_promotions_for_game(conn, self.gid)
         self.assertEqual(len(promos), 2)
 
     def test_upsert_replaces_existing(self):
-        with self.get_conn(self.db_path) as conn:
-            self.upsert_promotions(conn, self.gid, [{"promo_type": "giveaway", "description": "Old"}])
-            self.upsert_promotions(conn, self.gid, [{"promo_type": "discount", "description": "New"}])
-            promos = self.get_promotions_for_game(conn, self.gid)
+        with get_conn(self.db_path) as conn:
+            upsert_promotions(conn, self.gid, [{"promo_type": "giveaway", "description": "Old"}])
+            upsert_promotions(conn, self.gid, [{"promo_type": "discount", "description": "New"}])
+            promos = get_promotions_for_game(conn, self.gid)
         self.assertEqual(len(promos), 1)
         self.assertEqual(promos[0]["promo_type"], "discount")
 
     def test_empty_list_clears_promos(self):
-        with self.get_conn(self.db_path) as conn:
-            self.upsert_promotions(conn, self.gid, [{"promo_type": "giveaway", "description": "X"}])
-            self.upsert_promotions(conn, self.gid, [])
-            promos = self.get_promotions_for_game(conn, self.gid)
+        with get_conn(self.db_path) as conn:
+            upsert_promotions(conn, self.gid, [{"promo_type": "giveaway", "description": "X"}])
+            upsert_promotions(conn, self.gid, [])
+            promos = get_promotions_for_game(conn, self.gid)
         self.assertEqual(promos, [])
 
+    def test_batch_replaces_promos_per_game(self):
+        with get_conn(self.db_path) as conn:
+            upsert_promotions(conn, self.gid, [{"promo_type": "giveaway", "description": "Old"}])
+            upsert_promotions_batch(conn, {self.gid: [
+                {"promo_type": "discount",  "description": "New"},
+                {"promo_type": "fireworks", "description": "Boom"},
+            ]})
+            promos = get_promotions_for_game(conn, self.gid)
+        self.assertEqual(sorted(p["description"] for p in promos), ["Boom", "New"])
+
     def test_invalid_promo_type_raises(self):
-        with self.get_conn(self.db_path) as conn:
+        with get_conn(self.db_path) as conn:
             with self.assertRaises(sqlite3.IntegrityError):
-                self.upsert_promotions(conn, self.gid, [{"promo_type": "INVALID", "description": "X"}])
+                upsert_promotions(conn, self.gid, [{"promo_type": "INVALID", "description": "X"}])
 
     def test_valid_promo_types(self):
         valid = ["giveaway", "fireworks", "discount", "theme", "heritage", "special"]
-        with self.get_conn(self.db_path) as conn:
+        with get_conn(self.db_path) as conn, transaction(conn):
             for pt in valid:
-                self.upsert_promotions(conn, self.gid, [{"promo_type": pt, "description": "test"}])
-                promos = self.get_promotions_for_game(conn, self.gid)
+                upsert_promotions(conn, self.gid, [{"promo_type": pt, "description": "test"}])
+                promos = get_promotions_for_game(conn, self.gid)
                 self.assertEqual(promos[0]["promo_type"], pt)
 
 
@@ -228,88 +312,99 @@ class TestPromotionHelpers(unittest.TestCase):
 # RECIPIENT TESTS
 # ══════════════════════════════════════════════════════════
 class TestRecipientHelpers(unittest.TestCase):
-    def setUp(self):
-        self.db_path = make_tmp_db()
-        from admin.db import get_conn, add_recipient, list_recipients, \
-            deactivate_recipient, reactivate_recipient
-        self.get_conn = get_conn
-        self.add_recipient = add_recipient
-        self.list_recipients = list_recipients
-        self.deactivate_recipient = deactivate_recipient
-        self.reactivate_recipient = reactivate_recipient
+    @classmethod
+    def setUpClass(cls):
+        # One in-memory DB for the class, truncated after each test
+        cls.db_path = make_memory_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_memory_db()
 
     def tearDown(self):
-        teardown_tmp_db(self.db_path)
+        clear_tables(self.db_path)
 
     def test_add_with_both_channels(self):
-        with self.get_conn(self.db_path) as conn:
-            self.add_recipient(conn, "Alice", "+18601111111", "alice@test.com")
-            rows = self.list_recipients(conn)
+        with get_conn(self.db_path) as conn:
+            add_recipient(conn, "Alice", "+18601111111", "alice@test.com")
+            rows = list_recipients(conn)
         self.assertEqual(len(rows), 1)
         self.assertEqual(rows[0]["name"], "Alice")
 
     def test_add_phone_only(self):
-        with self.get_conn(self.db_path) as conn:
-            self.add_recipient(conn, "Bob", "+18602222222", None)
-            rows = self.list_recipients(conn)
+        with get_conn(self.db_path) as conn:
+            add_recipient(conn, "Bob", "+18602222222", None)
+            rows = list_recipients(conn)
         self.assertIsNone(rows[0]["email"])
 
     def test_add_email_only(self):
-        with self.get_conn(self.db_path) as conn:
-            self.add_recipient(conn, "Carol", None, "carol@test.com")
-            rows = self.list_recipients(conn)
+        with get_conn(self.db_path) as conn:
+            add_recipient(conn, "Carol", None, "carol@test.com")
+            rows = list_recipients(conn)
         self.assertIsNone(rows[0]["phone"])
 
     def test_no_contact_raises_value_error(self):
-        with self.get_conn(self.db_path) as conn:
+        with get_conn(self.db_path) as conn:
             with self.assertRaises(ValueError):
-                self.add_recipient(conn, "Ghost", None, None)
+                add_recipient(conn, "Ghost", None, None)
 
     def test_active_only_filter(self):
-        with self.get_conn(self.db_path) as conn:
-            self.add_recipient(conn, "Active", "+1111", None)
-            rid = self.add_recipient(conn, "Inactive", "+2222", None)
-            self.deactivate_recipient(conn, rid)
-            active = self.list_recipients(conn, active_only=True)
+        with get_conn(self.db_path) as conn:
+            add_recipient(conn, "Active", "+1111", None)
+            rid = add_recipient(conn, "Inactive", "+2222", None)
+            deactivate_recipient(conn, rid)
+            active = list_recipients(conn, active_only=True)
         self.assertEqual(len(active), 1)
         self.assertEqual(active[0]["name"], "Active")
 
     def test_list_all_includes_inactive(self):
-        with self.get_conn(self.db_path) as conn:
-            self.add_recipient(conn, "Active", "+1111", None)
-            rid = self.add_recipient(conn, "Inactive", "+2222", None)
-            self.deactivate_recipient(conn, rid)
-            all_r = self.list_recipients(conn, active_only=False)
+        with get_conn(self.db_path) as conn:
+            add_recipient(conn, "Active", "+1111", None)
+            rid = add_recipient(conn, "Inactive", "+2222", None)
+            deactivate_recipient(conn, rid)
+            all_r = list_recipients(conn, active_only=False)
         self.assertEqual(len(all_r), 2)
 
     def test_deactivate_success(self):
-        with self.get_conn(self.db_path) as conn:
-            rid = self.add_recipient(conn, "Dave", "+3333", None)
-            ok = self.deactivate_recipient(conn, rid)
-            active = self.list_recipients(conn, active_only=True)
+        with get_conn(self.db_path) as conn:
+            rid = add_recipient(conn, "Dave", "+3333", None)
+            ok = deactivate_recipient(conn, rid)
+            active = list_recipients(conn, active_only=True)
         self.assertTrue(ok)
         self.assertEqual(len(active), 0)
 
     def test_deactivate_nonexistent_returns_false(self):
-        with self.get_conn(self.db_path) as conn:
-            ok = self.deactivate_recipient(conn, 9999)
+        with get_conn(self.db_path) as conn:
+            ok = deactivate_recipient(conn, 9999)
         self.assertFalse(ok)
 
     def test_reactivate_success(self):
-        with self.get_conn(self.db_path) as conn:
-            rid = self.add_recipient(conn, "Eve", "+4444", None)
-            self.deactivate_recipient(conn, rid)
-            ok = self.reactivate_recipient(conn, rid)
-            active = self.list_recipients(conn, active_only=True)
+        with get_conn(self.db_path) as conn:
+            rid = add_recipient(conn, "Eve", "+4444", None)
+            deactivate_recipient(conn, rid)
+            ok = reactivate_recipient(conn, rid)
+            active = list_recipients(conn, active_only=True)
         self.assertTrue(ok)
         self.assertEqual(len(active), 1)
 
+    def test_list_projects_requested_columns(self):
+        with get_conn(self.db_path) as conn:
+            add_recipient(conn, "Fay", "+5555", None)
+            row = list_recipients(conn, cols=("id", "name"))[0]
+        self.assertEqual(row.keys(), ["id", "name"])
+
+    def test_list_rejects_unknown_column(self):
+        with get_conn(self.db_path) as conn:
+            with self.assertRaises(ValueError):
+                list_recipients(conn, cols=("id", "name; DROP TABLE recipients"))
+
     def test_supports_up_to_ten_recipients(self):
         """FR-34: system supports 1-10 recipients."""
-        with self.get_conn(self.db_path) as conn:
-            for i in range(10):
-                self.add_recipient(conn, f"Person{i}", f"+1800{i:07d}", None)
-            rows = self.list_recipients(conn)
+        with get_conn(self.db_path) as conn:
+            with transaction(conn):  # one BEGIN/COMMIT for all ten inserts
+                for i in range(10):
+                    add_recipient(conn, f"Person{i}", f"+1800{i:07d}", None)
+            rows = list_recipients(conn)
         self.assertEqual(len(rows), 10)
 
 
@@ -317,67 +412,90 @@ class TestRecipientHelpers(unittest.TestCase):
 # ALERT DEDUPLICATION TESTS
 # ══════════════════════════════════════════════════════════
 class TestAlertHelpers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.template = make_seeded_template(
+            games=[SAMPLE_GAME],
+            recipients=[{"name": "Alice", "phone": "+18001234567", "email": "alice@test.com"}],
+        )
+        cls.gid = cls.template.execute("SELECT id FROM games").fetchone()[0]
+        cls.rid = cls.template.execute("SELECT id FROM recipients").fetchone()[0]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.template.close()
+
     def setUp(self):
-        self.db_path = make_tmp_db()
-        from admin.db import get_conn, upsert_game, add_recipient, \
-            log_alert, has_alert_been_sent, get_alert_log
-        self.get_conn = get_conn
-        self.log_alert = log_alert
-        self.has_alert_been_sent = has_alert_been_sent
-        self.get_alert_log = get_alert_log
-        with self.get_conn(self.db_path) as conn:
-            self.gid = upsert_game(conn, SAMPLE_GAME)
-            self.rid = add_recipient(conn, "Alice", "+18001234567", "alice@test.com")
+        self.db_path = make_memory_db(self.template)
 
     def tearDown(self):
-        teardown_tmp_db(self.db_path)
+        teardown_memory_db()
 
     def test_not_sent_initially(self):
-        with self.get_conn(self.db_path) as conn:
-            result = self.has_alert_been_sent(conn, self.gid, self.rid, "sms")
+        with get_conn(self.db_path) as conn:
+            result = has_alert_been_sent(conn, self.gid, self.rid, "sms")
         self.assertFalse(result)
 
     def test_sent_after_log(self):
-        with self.get_conn(self.db_path) as conn:
-            self.log_alert(conn, self.gid, self.rid, "sms", "delivered")
-            result = self.has_alert_been_sent(conn, self.gid, self.rid, "sms")
+        with get_conn(self.db_path) as conn:
+            log_alert(conn, self.gid, self.rid, "sms", "delivered")
+            result = has_alert_been_sent(conn, self.gid, self.rid, "sms")
         self.assertTrue(result)
 
     def test_sms_and_email_independent(self):
-        with self.get_conn(self.db_path) as conn:
-            self.log_alert(conn, self.gid, self.rid, "sms", "delivered")
-            email_sent = self.has_alert_been_sent(conn, self.gid, self.rid, "email")
+        with get_conn(self.db_path) as conn:
+            log_alert(conn, self.gid, self.rid, "sms", "delivered")
+            email_sent = has_alert_been_sent(conn, self.gid, self.rid, "email")
         self.assertFalse(email_sent)
 
+    def test_get_sent_alerts_for_game(self):
+        with get_conn(self.db_path) as conn:
+            self.assertEqual(get_sent_alerts_for_game(conn, self.gid), set())
+            log_alert(conn, self.gid, self.rid, "sms", "delivered")
+            sent = get_sent_alerts_for_game(conn, self.gid)
+        self.assertEqual(sent, {(self.rid, "sms")})
+
     def test_duplicate_log_upserts_status(self):
-        with self.get_conn(self.db_path) as conn:
-            self.log_alert(conn, self.gid, self.rid, "sms", "pending")
-            self.log_alert(conn, self.gid, self.rid, "sms", "delivered")
-            logs = self.get_alert_log(conn, self.gid)
+        with get_conn(self.db_path) as conn:
+            log_alert(conn, self.gid, self.rid, "sms", "pending")
+            log_alert(conn, self.gid, self.rid, "sms", "delivered")
+            logs = get_alert_log(conn, self.gid)
         sms = [l for l in logs if l["channel"] == "sms"]
         self.assertEqual(len(sms), 1)
         self.assertEqual(sms[0]["status"], "delivered")
 
+    def test_log_alerts_batch(self):
+        with get_conn(self.db_path) as conn:
+            log_alerts(conn, [
+                (self.gid, self.rid, "sms",   "delivered"),
+                (self.gid, self.rid, "email", "failed"),
+            ])
+            logs = get_alert_log(conn, self.gid)
+        self.assertEqual({(l["channel"], l["status"]) for l in logs},
+                         {("sms", "delivered"), ("email", "failed")})
+
     def test_get_alert_log_filtered_by_game(self):
-        from admin.db import upsert_game
-        with self.get_conn(self.db_path) as conn:
+        with get_conn(self.db_path) as conn:
             gid2 = upsert_game(conn, {
                 **SAMPLE_GAME, "game_date": "2026-04-11", "day_of_week": "Saturday"
             })
-            self.log_alert(conn, self.gid,  self.rid, "sms",   "delivered")
-            self.log_alert(conn, gid2,       self.rid, "email", "delivered")
-            logs = self.get_alert_log(conn, self.gid)
+            log_alerts(conn, [
+                (self.gid, self.rid, "sms",   "delivered"),
+                (gid2,     self.rid, "email", "delivered"),
+            ])
+            logs = get_alert_log(conn, self.gid)
         self.assertEqual(len(logs), 1)
 
     def test_get_alert_log_all(self):
-        from admin.db import upsert_game
-        with self.get_conn(self.db_path) as conn:
+        with get_conn(self.db_path) as conn:
             gid2 = upsert_game(conn, {
                 **SAMPLE_GAME, "game_date": "2026-04-11", "day_of_week": "Saturday"
             })
-            self.log_alert(conn, self.gid,  self.rid, "sms",   "delivered")
-            self.log_alert(conn, gid2,       self.rid, "email", "delivered")
-            logs = self.get_alert_log(conn)
+            log_alerts(conn, [
+                (self.gid, self.rid, "sms",   "delivered"),
+                (gid2,     self.rid, "email", "delivered"),
+            ])
+            logs = get_alert_log(conn)
         self.assertEqual(len(logs), 2)
 
 
@@ -385,95 +503,130 @@ class TestAlertHelpers(unittest.TestCase):
 # ADMIN CLI TESTS
 # ══════════════════════════════════════════════════════════
 class TestAdminCLI(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.db_path = make_tmp_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_tmp_db(cls.db_path)
+
     def setUp(self):
-        self.db_path = make_tmp_db()
+        # The CLI resolves its DB from the env; patch.dict restores it afterwards
+        env = patch.dict(os.environ, {"YARDGOATS_DB": str(self.db_path)})
+        env.start()
+        self.addCleanup(env.stop)
 
     def tearDown(self):
-        teardown_tmp_db(self.db_path)
-
-    def _run(self, argv):
-        from admin.manage import main
-        with patch("sys.argv", ["manage.py"] + argv):
-            with patch("sys.stdout", new_callable=StringIO) as mock_out:
-                try:
-                    main()
-                except SystemExit as e:
-                    return mock_out.getvalue(), e.code
-                return mock_out.getvalue(), 0
+        clear_tables(self.db_path)
+
+    def _run(self, cmd, **args):
+        """Call a cmd_* handler directly with a built Namespace — no argv parse."""
+        out = StringIO()
+        with redirect_stdout(out):
+            try:
+                cmd(Namespace(**args))
+            except SystemExit as e:
+                return out.getvalue(), e.code
+            return out.getvalue(), 0
 
     def test_add_and_list(self):
-        out, code = self._run(["add", "--name", "Frank", "--phone", "+18605559999"])
+        out, code = self._run(cmd_add, name="Frank", phone="+18605559999", email=None)
         self.assertEqual(code, 0)
         self.assertIn("Added", out)
         self.assertIn("Frank", out)
 
-        out, code = self._run(["list"])
+        out, code = self._run(cmd_list, all=False)
         self.assertIn("Frank", out)
 
+    def test_main_dispatches_argv(self):
+        # One end-to-end pass through argparse + the dispatch table
+        out = StringIO()
+        with patch("sys.argv", ["manage.py", "add", "--name", "Kim", "--email", "kim@test.com"]), \
+                redirect_stdout(out):
+            manage_main()
+        self.assertIn("Added", out.getvalue())
+        self.assertIn("Kim", out.getvalue())
+
     def test_add_requires_phone_or_email(self):
-        out, code = self._run(["add", "--name", "Ghost"])
+        out, code = self._run(cmd_add, name="Ghost", phone=None, email=None)
         self.assertNotEqual(code, 0)
 
     def test_remove_deactivates(self):
-        from admin.db import get_conn, add_recipient
         with get_conn(self.db_path) as conn:
             rid = add_recipient(conn, "Hank", "+18885550001", None)
-        out, code = self._run(["remove", "--id", str(rid)])
+        out, code = self._run(cmd_remove, id=rid)
         self.assertEqual(code, 0)
         self.assertIn("Deactivated", out)
 
     def test_restore_reactivates(self):
-        from admin.db import get_conn, add_recipient, deactivate_recipient
         with get_conn(self.db_path) as conn:
             rid = add_recipient(conn, "Iris", "+18885550002", None)
             deactivate_recipient(conn, rid)
-        out, code = self._run(["restore", "--id", str(rid)])
+        out, code = self._run(cmd_restore, id=rid)
         self.assertEqual(code, 0)
         self.assertIn("Restored", out)
 
     def test_remove_nonexistent_exits_nonzero(self):
-        out, code = self._run(["remove", "--id", "9999"])
+        out, code = self._run(cmd_remove, id=9999)
         self.assertNotEqual(code, 0)
 
     def test_status_shows_summary(self):
-        out, code = self._run(["status"])
+        out, code = self._run(cmd_status)
         self.assertEqual(code, 0)
         self.assertIn("Active recipients", out)
         self.assertIn("Last data refresh", out)
 
     def test_list_all_shows_inactive(self):
-        from admin.db import get_conn, add_recipient, deactivate_recipient
         with get_conn(self.db_path) as conn:
             rid = add_recipient(conn, "Ivy", "+19995550001", None)
             deactivate_recipient(conn, rid)
-        out, code = self._run(["list", "--all"])
+        out, code = self._run(cmd_list, all=True)
         self.assertIn("Ivy", out)
 
     def test_list_active_hides_inactive(self):
-        from admin.db import get_conn, add_recipient, deactivate_recipient
         with get_conn(self.db_path) as conn:
             rid = add_recipient(conn, "Jack", "+19995550002", None)
             deactivate_recipient(conn, rid)
-        out, code = self._run(["list"])
+        out, code = self._run(cmd_list, all=False)
         self.assertNotIn("Jack", out)
 
 
 # ══════════════════════════════════════════════════════════
 # RUNNER
 # ══════════════════════════════════════════════════════════
+TEST_CLASSES = [
+    TestSchemaInit,
+    TestGameHelpers,
+    TestPromotionHelpers,
+    TestRecipientHelpers,
+    TestAlertHelpers,
+    TestAdminCLI,
+]
+
+
+def _run_class(name: str) -> tuple[bool, int, str]:
+    """
+    Worker: run one TestCase class in its own process.
+    Each class has its own DB (temp file or in-memory), so classes never
+    share state. Output is buffered and returned so reports don't interleave.
+    """
+    stream = StringIO()
+    suite  = unittest.TestLoader().loadTestsFromTestCase(globals()[name])
+    result = unittest.TextTestRunner(stream=stream, verbosity=2).run(suite)
+    return result.wasSuccessful(), result.testsRun, stream.getvalue()
+
+
 if __name__ == "__main__":
-    loader = unittest.TestLoader()
-    suite  = unittest.TestSuite()
-    for cls in [
-        TestSchemaInit,
-        TestGameHelpers,
-        TestPromotionHelpers,
-        TestRecipientHelpers,
-        TestAlertHelpers,
-        TestAdminCLI,
-    ]:
-        suite.addTests(loader.loadTestsFromTestCase(cls))
-
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-    sys.exit(0 if result.wasSuccessful() else 1)
+    from concurrent.futures import ProcessPoolExecutor
+
+    names = [cls.__name__ for cls in TEST_CLASSES]
+    with ProcessPoolExecutor(max_workers=min(len(names), os.cpu_count() or 1)) as pool:
+        results = list(pool.map(_run_class, names))
+
+    for _, _, report in results:
+        sys.stderr.write(report)
+    ok = all(success for success, _, _ in results)
+    sys.stderr.write(f"\nRan {sum(n for _, n, _ in results)} tests across "
+                     f"{len(names)} classes\n\n{'OK' if ok else 'FAILED'}\n")
+    sys.exit(0 if ok else 1)
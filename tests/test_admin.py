@@ -6,46 +6,38 @@ Run: python tests/test_admin.py
 
 import os
 import sys
-import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
+from contextlib import redirect_stdout
 from io import StringIO
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+ROOT = str(Path(__file__).parent.parent)
+if ROOT not in sys.path:  # no pyproject/editable install — add the repo root once
+    sys.path.insert(0, ROOT)
 
 from admin.db import (
-    init_db, get_conn, add_recipient, list_recipients,
+    init_db, get_conn, close_db, add_recipient, list_recipients,
     deactivate_recipient, reactivate_recipient, get_data_freshness
 )
 from admin.manage import build_parser, cmd_add, cmd_list, cmd_remove, cmd_restore, cmd_status
-
-
-def make_tmp_db():
-    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
-    tmp.close()
-    os.environ["YARDGOATS_DB"] = tmp.name
-    init_db(Path(tmp.name))
-    return Path(tmp.name)
-
-
-def teardown_tmp_db(path):
-    if "YARDGOATS_DB" in os.environ:
-        del os.environ["YARDGOATS_DB"]
-    import gc
-    gc.collect() # Force cleanup of any lingering connections
-    # On Windows, we sometimes need to wait a tiny bit or force more collection
-    import time
-    time.sleep(0.1)
-    path.unlink(missing_ok=True)
+from _dbutil import (
+    make_tmp_db, teardown_tmp_db, make_memory_db, teardown_memory_db, clear_tables,
+)
 
 
 class TestRecipientLogic(unittest.TestCase):
-    def setUp(self):
-        self.db_path = make_tmp_db()
+    @classmethod
+    def setUpClass(cls):
+        # One in-memory DB for the class, truncated after each test
+        cls.db_path = make_memory_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_memory_db()
 
     def tearDown(self):
-        teardown_tmp_db(self.db_path)
+        clear_tables(self.db_path)
 
     def test_add_recipient_success(self):
         with get_conn(self.db_path) as conn:
@@ -54,7 +46,6 @@ class TestRecipientLogic(unittest.TestCase):
             rows = list_recipients(conn, active_only=False)
             self.assertEqual(len(rows), 1)
             self.assertEqual(rows[0]["name"], "Alice")
-        # Connection closed by context manager
 
     def test_add_recipient_requires_contact(self):
         with get_conn(self.db_path) as conn:
@@ -96,16 +87,27 @@ class TestRecipientLogic(unittest.TestCase):
 
 
 class TestAdminCLI(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.db_path = make_tmp_db()
+        cls.parser  = build_parser()  # parsing doesn't mutate it — build once
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_tmp_db(cls.db_path)
+
     def setUp(self):
-        self.db_path = make_tmp_db()
-        self.parser = build_parser()
+        # The CLI resolves its DB from the env; patch.dict restores it afterwards
+        env = patch.dict(os.environ, {"YARDGOATS_DB": str(self.db_path)})
+        env.start()
+        self.addCleanup(env.stop)
 
     def tearDown(self):
-        teardown_tmp_db(self.db_path)
+        clear_tables(self.db_path)
 
     def test_cli_add_recipient(self):
         args = self.parser.parse_args(["add", "--name", "Charlie", "--phone", "+18605550003"])
-        with patch('sys.stdout', new=StringIO()) as fake_out:
+        with redirect_stdout(StringIO()) as fake_out:
             cmd_add(args)
             self.assertIn("Added recipient", fake_out.getvalue())
         
@@ -116,7 +118,7 @@ class TestAdminCLI(unittest.TestCase):
 
     def test_cli_add_fails_without_contact(self):
         args = self.parser.parse_args(["add", "--name", "NoContact"])
-        with patch('sys.stdout', new=StringIO()) as fake_out:
+        with redirect_stdout(StringIO()) as fake_out:
             with self.assertRaises(SystemExit):
                 cmd_add(args)
             self.assertIn("ERROR", fake_out.getvalue())
@@ -126,7 +128,7 @@ class TestAdminCLI(unittest.TestCase):
             add_recipient(conn, "Dave", "+18605550004", None)
         
         args = self.parser.parse_args(["list"])
-        with patch('sys.stdout', new=StringIO()) as fake_out:
+        with redirect_stdout(StringIO()) as fake_out:
             cmd_list(args)
             output = fake_out.getvalue()
             self.assertIn("Dave", output)
@@ -137,7 +139,7 @@ class TestAdminCLI(unittest.TestCase):
             rid = add_recipient(conn, "Eve", "+18605550005", None)
         
         args = self.parser.parse_args(["remove", "--id", str(rid)])
-        with patch('sys.stdout', new=StringIO()) as fake_out:
+        with redirect_stdout(StringIO()) as fake_out:
             cmd_remove(args)
             self.assertIn("Deactivated recipient", fake_out.getvalue())
         
@@ -149,7 +151,7 @@ class TestAdminCLI(unittest.TestCase):
             add_recipient(conn, "Frank", "+18605550006", None)
         
         args = self.parser.parse_args(["status"])
-        with patch('sys.stdout', new=StringIO()) as fake_out:
+        with redirect_stdout(StringIO()) as fake_out:
             cmd_status(args)
             output = fake_out.getvalue()
             self.assertIn("Active recipients : 1", output)
@@ -157,11 +159,16 @@ class TestAdminCLI(unittest.TestCase):
 
 
 class TestDBTransactions(unittest.TestCase):
-    def setUp(self):
-        self.db_path = make_tmp_db()
+    @classmethod
+    def setUpClass(cls):
+        cls.db_path = make_tmp_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_tmp_db(cls.db_path)
 
     def tearDown(self):
-        teardown_tmp_db(self.db_path)
+        clear_tables(self.db_path)
 
     def test_transaction_rollback_on_error(self):
         from admin.db import get_conn
@@ -178,21 +185,16 @@ class TestDBTransactions(unittest.TestCase):
             self.assertEqual(len(rows), 0, "Transaction should have rolled back")
 
     def test_init_db_creates_tables(self):
-        # Create a new empty db
-        new_db = Path(tempfile.mktemp(suffix=".db"))
+        # Create a new empty db next to the class DB (removed with its dir)
+        new_db = self.db_path.parent / "fresh.db"
         try:
             init_db(new_db)
             with get_conn(new_db) as conn:
                 # Check for games table
                 row = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='games'").fetchone()
                 self.assertIsNotNone(row)
-            # Connection closed by context manager
         finally:
-            import gc
-            gc.collect()
-            import time
-            time.sleep(0.1)
-            new_db.unlink(missing_ok=True)
+            close_db()
 
 
 if __name__ == "__main__":
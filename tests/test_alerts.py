@@ -6,138 +6,179 @@ Run: python tests/test_alerts.py
 
 import os
 import sys
-import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta, datetime
 from pathlib import Path
+from types import MappingProxyType
 from unittest.mock import MagicMock, patch
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-
-def make_tmp_db():
-    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
-    tmp.close()
-    os.environ["YARDGOATS_DB"] = tmp.name
-    from admin.db import init_db
-    init_db(Path(tmp.name))
-    return Path(tmp.name)
-
-
-def teardown_tmp_db(path):
-    if "YARDGOATS_DB" in os.environ:
-        del os.environ["YARDGOATS_DB"]
-    import gc
-    gc.collect()
-    import time
-    time.sleep(0.3)
-    path.unlink(missing_ok=True)
+ROOT = str(Path(__file__).parent.parent)
+if ROOT not in sys.path:  # no pyproject/editable install — add the repo root once
+    sys.path.insert(0, ROOT)
+
+import alerts.sms as sms
+from admin.db import (
+    get_conn, upsert_game, upsert_promotions,
+    add_recipient, get_alert_log,
+)
+from alerts.engine import (
+    get_qualifying_games, build_alert_payload, check_data_freshness,
+    format_sms_message, format_email_subject,
+)
+from alerts.sms import send_sms, send_sms_bulk, _backoff, RETRY_MAX_SEC, _mask as mask_phone
+from alerts.email_sender import send_email, render_alert_html, _mask as mask_email
+from alerts.main import run, main
+from _dbutil import make_memory_db, teardown_memory_db, close_template, clear_tables
+
+
+# Every key build_alert_payload() must return
+_REQUIRED_PAYLOAD_KEYS = frozenset({
+    "game_id", "game_date", "display_date", "day", "time",
+    "opponent", "ticket_url", "promo_summary", "promos", "has_promos",
+})
+
+# Over the 320-char SMS budget — shared by the truncation tests
+_LONG_X = "x" * 400
+
+# Read-only email payloads shared by every email test
+_EMAIL_PAYLOAD_PROMOS = MappingProxyType({
+    "game_id": 1,
+    "game_date": "2026-04-10",
+    "display_date": "Fri Apr 10",
+    "day": "Friday",
+    "time": "7:05 PM",
+    "opponent": "Portland Sea Dogs",
+    "ticket_url": "https://milb.com/hartford/tickets",
+    "promo_summary": "🎁 Cowboy Hat Giveaway | 🎆 Fireworks",
+    "promos": (
+        MappingProxyType({"promo_type": "giveaway",  "description": "Cowboy Hat Giveaway"}),
+        MappingProxyType({"promo_type": "fireworks", "description": "Post-game fireworks"}),
+    ),
+    "has_promos": True,
+})
+_EMAIL_PAYLOAD_NO_PROMOS = MappingProxyType({
+    **_EMAIL_PAYLOAD_PROMOS, "promos": (), "has_promos": False,
+})
+
+
+def tearDownModule():
+    # Close the template too, so no connection outlives the test run
+    close_template()
 
 
 def insert_game(conn, game_date: str, dow: str, opponent="Sea Dogs",
-                start_time="7:05 PM", ticket_url="https://milb.com/hartford/tickets"):
-    from admin.db import upsert_game
+                start_time="7:05 PM", ticket_url="https://milb.com/hartford/tickets",
+                is_home=1):
     return upsert_game(conn, {
         "game_date": game_date, "day_of_week": dow, "start_time": start_time,
-        "opponent": opponent, "is_home": 1, "ticket_url": ticket_url,
+        "opponent": opponent, "is_home": is_home, "ticket_url": ticket_url,
     })
 
 
+_STALE_GAME_SQL = """
+    INSERT INTO games (game_date, day_of_week, start_time, opponent,
+                       is_home, ticket_url, updated_at)
+    VALUES (?, ?, '7:05 PM', 'Sea Dogs', 1, NULL, datetime('now', '-3 days'))
+"""
+
+
+def insert_stale_game(conn, game_date="2026-04-10", dow="Friday"):
+    """Insert a home game last refreshed 3 days ago (past the staleness guard)."""
+    conn.execute(_STALE_GAME_SQL, (game_date, dow))
+
+
 def insert_recipient(conn, name="Alice", phone="+18605550001", email="alice@test.com"):
-    from admin.db import add_recipient
     return add_recipient(conn, name, phone, email)
 
 
+def insert_recipients_bulk(conn, rows):
+    """Insert (name, phone, email) rows with one executemany; get_conn commits once."""
+    conn.executemany("INSERT INTO recipients (name, phone, email) VALUES (?, ?, ?)", rows)
+
+
+def make_sms_client(success=True):
+    """Mock Twilio client whose messages.create succeeds or always raises."""
+    m = MagicMock()
+    if success:
+        m.messages.create.return_value = MagicMock(sid="SM_TEST", status="delivered")
+    else:
+        m.messages.create.side_effect = Exception("fail")
+    return m
+
+
+def make_email_client(status_code=202):
+    """Mock SendGrid client whose send() returns the given status."""
+    m = MagicMock()
+    m.send.return_value = MagicMock(status_code=status_code, body="")
+    return m
+
+
 # ══════════════════════════════════════════════════════════
 # ENGINE LOGIC TESTS
 # ══════════════════════════════════════════════════════════
 class TestEngineQualifyingGames(unittest.TestCase):
-    def setUp(self):
-        self.db = make_tmp_db()
-        from admin.db import get_conn
-        self.get_conn = get_conn
+    @classmethod
+    def setUpClass(cls):
+        # Schema copied once per class; tests are isolated by clear_tables
+        cls.db = make_memory_db()
 
-    def tearDown(self):
-        teardown_tmp_db(self.db)
+    @classmethod
+    def tearDownClass(cls):
+        teardown_memory_db()
 
-    def test_friday_qualifies(self):
-        from alerts.engine import get_qualifying_games
-        with self.get_conn(self.db) as conn:
+    def tearDown(self):
+        clear_tables(self.db)
+
+    # (label, game_date, day_of_week, is_home, checked date, expected count)
+    QUALIFY_CASES = [
+        ("fri",        "2026-04-10", "Friday",    1, date(2026, 4, 10), 1),
+        ("sat",        "2026-04-11", "Saturday",  1, date(2026, 4, 11), 1),
+        ("sun",        "2026-04-12", "Sunday",    1, date(2026, 4, 12), 1),
+        ("tue",        "2026-04-14", "Tuesday",   1, date(2026, 4, 14), 0),
+        ("wed",        "2026-04-15", "Wednesday", 1, date(2026, 4, 15), 0),
+        ("away",       "2026-04-10", "Friday",    0, date(2026, 4, 10), 0),
+        ("wrong_date", "2026-04-10", "Friday",    1, date(2026, 4, 11), 0),
+    ]
+
+    def test_qualifying(self):
+        with get_conn(self.db) as conn:
+            for label, game_date, dow, is_home, check, expected in self.QUALIFY_CASES:
+                with self.subTest(label):
+                    insert_game(conn, game_date, dow, is_home=is_home)
+                    games = get_qualifying_games(conn, check)
+                    conn.rollback()  # undo the insert before the next case
+                    self.assertEqual(len(games), expected)
+
+    def test_accepts_iso_date_string(self):
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
-            games = get_qualifying_games(conn, date(2026, 4, 10))
-        self.assertEqual(len(games), 1)
-
-    def test_saturday_qualifies(self):
-        from alerts.engine import get_qualifying_games
-        with self.get_conn(self.db) as conn:
-            insert_game(conn, "2026-04-11", "Saturday")
-            games = get_qualifying_games(conn, date(2026, 4, 11))
+            games = get_qualifying_games(conn, "2026-04-10")
         self.assertEqual(len(games), 1)
 
-    def test_sunday_qualifies(self):
-        from alerts.engine import get_qualifying_games
-        with self.get_conn(self.db) as conn:
-            insert_game(conn, "2026-04-12", "Sunday")
-            games = get_qualifying_games(conn, date(2026, 4, 12))
-        self.assertEqual(len(games), 1)
-
-    def test_tuesday_does_not_qualify(self):
-        from alerts.engine import get_qualifying_games
-        with self.get_conn(self.db) as conn:
-            insert_game(conn, "2026-04-14", "Tuesday")
-            games = get_qualifying_games(conn, date(2026, 4, 14))
-        self.assertEqual(len(games), 0)
-
-    def test_wednesday_does_not_qualify(self):
-        from alerts.engine import get_qualifying_games
-        with self.get_conn(self.db) as conn:
-            insert_game(conn, "2026-04-15", "Wednesday")
-            games = get_qualifying_games(conn, date(2026, 4, 15))
-        self.assertEqual(len(games), 0)
-
-    def test_away_game_does_not_qualify(self):
-        from alerts.engine import get_qualifying_games
-        from admin.db import upsert_game
-        with self.get_conn(self.db) as conn:
-            upsert_game(conn, {
-                "game_date": "2026-04-10", "day_of_week": "Friday",
-                "start_time": "7:05 PM", "opponent": "Sea Dogs",
-                "is_home": 0, "ticket_url": None,
-            })
-            games = get_qualifying_games(conn, date(2026, 4, 10))
-        self.assertEqual(len(games), 0)
-
-    def test_wrong_date_no_results(self):
-        from alerts.engine import get_qualifying_games
-        with self.get_conn(self.db) as conn:
-            insert_game(conn, "2026-04-10", "Friday")
-            games = get_qualifying_games(conn, date(2026, 4, 11))
-        self.assertEqual(len(games), 0)
-
 
 class TestBuildAlertPayload(unittest.TestCase):
-    def setUp(self):
-        self.db = make_tmp_db()
-        from admin.db import get_conn, upsert_promotions
-        self.get_conn = get_conn
-        self.upsert_promotions = upsert_promotions
+    @classmethod
+    def setUpClass(cls):
+        # Schema copied once per class; tests are isolated by clear_tables
+        cls.db = make_memory_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_memory_db()
 
     def tearDown(self):
-        teardown_tmp_db(self.db)
+        clear_tables(self.db)
 
     def test_payload_all_fields_present(self):
-        from alerts.engine import get_qualifying_games, build_alert_payload
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             games = get_qualifying_games(conn, date(2026, 4, 10))
         payload = build_alert_payload(games[0])
-        required = {"game_id","game_date","display_date","day","time",
-                    "opponent","ticket_url","promo_summary","promos","has_promos"}
-        self.assertEqual(required, set(payload.keys()))
+        self.assertEqual(_REQUIRED_PAYLOAD_KEYS, set(payload.keys()))
 
     def test_payload_tbd_when_no_promos(self):
-        from alerts.engine import get_qualifying_games, build_alert_payload
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             games = get_qualifying_games(conn, date(2026, 4, 10))
         payload = build_alert_payload(games[0])
@@ -145,10 +186,9 @@ class TestBuildAlertPayload(unittest.TestCase):
         self.assertIn("TBD", payload["promo_summary"])
 
     def test_payload_includes_promos_when_present(self):
-        from alerts.engine import get_qualifying_games, build_alert_payload
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             gid = insert_game(conn, "2026-04-10", "Friday")
-            self.upsert_promotions(conn, gid, [
+            upsert_promotions(conn, gid, [
                 {"promo_type": "giveaway", "description": "Cowboy Hat"},
                 {"promo_type": "fireworks", "description": "Post-game fireworks"},
             ])
@@ -159,9 +199,32 @@ class TestBuildAlertPayload(unittest.TestCase):
         self.assertIn("🎁", payload["promo_summary"])
         self.assertIn("🎆", payload["promo_summary"])
 
+    def test_promo_description_is_trimmed(self):
+        with get_conn(self.db) as conn:
+            gid = insert_game(conn, "2026-04-10", "Friday")
+            upsert_promotions(conn, gid, [
+                {"promo_type": "giveaway", "description": "  Cowboy Hat\n"},
+            ])
+            games = get_qualifying_games(conn, date(2026, 4, 10))
+        payload = build_alert_payload(games[0])
+        self.assertEqual(
+            payload["promos"], [{"promo_type": "giveaway", "description": "Cowboy Hat"}]
+        )
+
+    def test_promo_description_with_separators_kept_intact(self):
+        with get_conn(self.db) as conn:
+            gid = insert_game(conn, "2026-04-10", "Friday")
+            upsert_promotions(conn, gid, [
+                {"promo_type": "special", "description": "Doors: 6pm || Gates: 6:30"},
+            ])
+            games = get_qualifying_games(conn, date(2026, 4, 10))
+        payload = build_alert_payload(games[0])
+        self.assertEqual(payload["promos"], [
+            {"promo_type": "special", "description": "Doors: 6pm || Gates: 6:30"},
+        ])
+
     def test_display_date_formatted(self):
-        from alerts.engine import get_qualifying_games, build_alert_payload
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             games = get_qualifying_games(conn, date(2026, 4, 10))
         payload = build_alert_payload(games[0])
@@ -172,57 +235,55 @@ class TestBuildAlertPayload(unittest.TestCase):
 
 
 class TestSMSFormatting(unittest.TestCase):
-    def _make_payload(self, with_promos=False):
-        promos = [{"promo_type": "giveaway", "description": "Cowboy Hat Giveaway"}] if with_promos else []
-        return {
+    @classmethod
+    def setUpClass(cls):
+        # Payloads are read-only here — build each variant once per class
+        cls.payload_no_promos = {
             "day": "Friday", "display_date": "Fri Apr 10",
             "time": "7:05 PM", "opponent": "Portland Sea Dogs",
             "ticket_url": "https://milb.com/hartford/tickets",
-            "promo_summary": "🎁 Cowboy Hat Giveaway" if with_promos else "Promotions TBD — check dashboard",
-            "promos": promos, "has_promos": with_promos,
+            "promo_summary": "Promotions TBD — check dashboard",
+            "promos": [], "has_promos": False,
         }
+        cls.payload_promos = {
+            **cls.payload_no_promos,
+            "promo_summary": "🎁 Cowboy Hat Giveaway",
+            "promos": [{"promo_type": "giveaway", "description": "Cowboy Hat Giveaway"}],
+            "has_promos": True,
+        }
+        cls.payload_long = {
+            **cls.payload_no_promos,
+            "promo_summary": "🎁 " + _LONG_X,
+        }
+        # Formatting is pure — render each variant once and share the text
+        cls.sms_no_promos = format_sms_message(cls.payload_no_promos)
+        cls.sms_promos    = format_sms_message(cls.payload_promos)
+        cls.sms_long      = format_sms_message(cls.payload_long)
 
     def test_sms_within_320_chars(self):
-        from alerts.engine import format_sms_message
-        msg = format_sms_message(self._make_payload())
-        self.assertLessEqual(len(msg), 320)
+        self.assertLessEqual(len(self.sms_no_promos), 320)
 
     def test_sms_contains_game_info(self):
-        from alerts.engine import format_sms_message
-        msg = format_sms_message(self._make_payload())
-        self.assertIn("Friday", msg)
-        self.assertIn("Portland Sea Dogs", msg)
-        self.assertIn("7:05 PM", msg)
-        self.assertIn("milb.com", msg)
+        # subTest reports every missing piece, not just the first
+        for needle in ("Friday", "Portland Sea Dogs", "7:05 PM", "milb.com"):
+            with self.subTest(needle=needle):
+                self.assertIn(needle, self.sms_no_promos)
 
     def test_sms_tbd_when_no_promos(self):
-        from alerts.engine import format_sms_message
-        msg = format_sms_message(self._make_payload(with_promos=False))
-        self.assertIn("TBD", msg)
+        self.assertIn("TBD", self.sms_no_promos)
 
     def test_sms_shows_promo_when_present(self):
-        from alerts.engine import format_sms_message
-        msg = format_sms_message(self._make_payload(with_promos=True))
-        self.assertIn("Cowboy Hat", msg)
+        self.assertIn("Cowboy Hat", self.sms_promos)
 
     def test_sms_truncates_if_over_320(self):
-        from alerts.engine import format_sms_message
-        long_payload = {
-            **self._make_payload(),
-            "promo_summary": "🎁 " + ("x" * 400),
-        }
-        msg = format_sms_message(long_payload)
-        self.assertLessEqual(len(msg), 320)
+        self.assertLessEqual(len(self.sms_long), 320)
 
     def test_sms_includes_stop_instruction(self):
-        from alerts.engine import format_sms_message
-        msg = format_sms_message(self._make_payload())
-        self.assertIn("STOP", msg)
+        self.assertIn("STOP", self.sms_no_promos)
 
 
 class TestEmailSubject(unittest.TestCase):
     def test_subject_with_promo(self):
-        from alerts.engine import format_email_subject
         payload = {
             "day": "Friday", "display_date": "Fri Apr 10",
             "opponent": "Sea Dogs", "has_promos": True,
@@ -234,7 +295,6 @@ class TestEmailSubject(unittest.TestCase):
         self.assertIn("Cowboy Hat", subject)
 
     def test_subject_without_promo(self):
-        from alerts.engine import format_email_subject
         payload = {
             "day": "Saturday", "display_date": "Sat Apr 11",
             "opponent": "Rumble Ponies", "has_promos": False, "promos": [],
@@ -246,37 +306,31 @@ class TestEmailSubject(unittest.TestCase):
 
 
 class TestDataFreshness(unittest.TestCase):
-    def setUp(self):
-        self.db = make_tmp_db()
-        from admin.db import get_conn
-        self.get_conn = get_conn
+    @classmethod
+    def setUpClass(cls):
+        # Schema copied once per class; tests are isolated by clear_tables
+        cls.db = make_memory_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_memory_db()
 
     def tearDown(self):
-        teardown_tmp_db(self.db)
+        clear_tables(self.db)
 
     def test_empty_db_is_stale(self):
-        from alerts.engine import check_data_freshness
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             self.assertFalse(check_data_freshness(conn))
 
     def test_fresh_data_passes(self):
-        from alerts.engine import check_data_freshness
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             # updated_at defaults to CURRENT_TIMESTAMP — should be fresh
             self.assertTrue(check_data_freshness(conn))
 
     def test_stale_data_fails(self):
-        from alerts.engine import check_data_freshness
-        from admin.db import upsert_game
-        with self.get_conn(self.db) as conn:
-            # Insert game with old updated_at timestamp (3 days ago)
-            conn.execute("""
-                INSERT INTO games (game_date, day_of_week, start_time, opponent,
-                                   is_home, ticket_url, updated_at)
-                VALUES ('2026-04-10','Friday','7:05 PM','Sea Dogs',1,NULL,
-                        datetime('now','-3 days'))
-            """)
+        with get_conn(self.db) as conn:
+            insert_stale_game(conn)
             self.assertFalse(check_data_freshness(conn))
 
 
@@ -284,119 +338,206 @@ class TestDataFreshness(unittest.TestCase):
 # SMS DELIVERY TESTS
 # ══════════════════════════════════════════════════════════
 class TestSMSDelivery(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # One Twilio mock for the class; each test gets it freshly reset
+        cls.twilio = MagicMock()
+        # Sends aren't paced in these tests — RateLimiter has its own below
+        cls._pacer = patch("alerts.sms._PACER")
+        cls._pacer.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._pacer.stop()
+
+    def setUp(self):
+        self.twilio.messages.create.return_value = MagicMock(sid="SM123", status="delivered")
+
+    def tearDown(self):
+        # Reset create() itself — a full reset on the client would also
+        # clobber MagicMock's own __bool__ return value
+        self.twilio.messages.create.reset_mock(return_value=True, side_effect=True)
+
     def test_dry_run_returns_success(self):
-        from alerts.sms import send_sms
         ok, detail = send_sms("+18605550001", "Test message", dry_run=True)
         self.assertTrue(ok)
         self.assertEqual(detail, "dry_run")
 
     def test_sends_via_mock_client(self):
-        from alerts.sms import send_sms
-        mock_msg = MagicMock()
-        mock_msg.sid    = "SM123"
-        mock_msg.status = "delivered"
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_msg
-
         with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
-            ok, detail = send_sms("+18605550001", "Hello", client=mock_client)
+            ok, detail = send_sms("+18605550001", "Hello", client=self.twilio)
         self.assertTrue(ok)
         self.assertEqual(detail, "delivered")
-        mock_client.messages.create.assert_called_once()
+        self.twilio.messages.create.assert_called_once()
 
     def test_truncates_message_over_320(self):
-        from alerts.sms import send_sms
-        long_msg = "x" * 400
-        mock_msg = MagicMock()
-        mock_msg.sid = "SM999"
-        mock_msg.status = "delivered"
-        mock_client = MagicMock()
-        mock_client.messages.create.return_value = mock_msg
-
         with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
-            send_sms("+18605550001", long_msg, client=mock_client)
+            send_sms("+18605550001", _LONG_X, client=self.twilio)
 
-        sent_body = mock_client.messages.create.call_args[1]["body"]
+        sent_body = self.twilio.messages.create.call_args[1]["body"]
         self.assertLessEqual(len(sent_body), 320)
 
     def test_retries_on_failure_then_succeeds(self):
-        from alerts.sms import send_sms
-        mock_msg = MagicMock()
-        mock_msg.sid    = "SM456"
-        mock_msg.status = "delivered"
-        mock_client = MagicMock()
         # Fail twice, succeed on third attempt
-        mock_client.messages.create.side_effect = [
+        self.twilio.messages.create.side_effect = [
             Exception("timeout"),
             Exception("timeout"),
-            mock_msg,
+            MagicMock(sid="SM456", status="delivered"),
         ]
         with patch("alerts.sms.time.sleep"):  # don't actually sleep in tests
             with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
-                ok, detail = send_sms("+18605550001", "Hello", client=mock_client)
+                ok, detail = send_sms("+18605550001", "Hello", client=self.twilio)
         self.assertTrue(ok)
-        self.assertEqual(mock_client.messages.create.call_count, 3)
+        self.assertEqual(self.twilio.messages.create.call_count, 3)
 
     def test_returns_false_after_max_retries(self):
-        from alerts.sms import send_sms
-        mock_client = MagicMock()
-        mock_client.messages.create.side_effect = Exception("permanent failure")
+        self.twilio.messages.create.side_effect = Exception("permanent failure")
         with patch("alerts.sms.time.sleep"):
             with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
-                ok, detail = send_sms("+18605550001", "Hello", client=mock_client)
+                ok, detail = send_sms("+18605550001", "Hello", client=self.twilio)
         self.assertFalse(ok)
-        self.assertEqual(mock_client.messages.create.call_count, 3)
+        self.assertEqual(self.twilio.messages.create.call_count, 3)
+
+    def test_backoff_is_jittered_and_capped(self):
+        for attempt in range(1, 10):
+            wait = _backoff(attempt)
+            self.assertGreaterEqual(wait, 0)
+            self.assertLessEqual(wait, min(RETRY_MAX_SEC, 2 * 2 ** (attempt - 1)))
+
+    def test_rate_limited_retry_wait_is_capped(self):
+        # TwilioRestException carries the HTTP status, not response headers
+        rate_limited = Exception("HTTP 429 error: Too Many Requests")
+        rate_limited.status = 429
+        self.twilio.messages.create.side_effect = [
+            rate_limited, MagicMock(sid="SM789", status="queued"),
+        ]
+        with patch("alerts.sms.time.sleep") as mock_sleep:
+            with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
+                ok, _ = send_sms("+18605550001", "Hello", client=self.twilio)
+        self.assertTrue(ok)
+        (wait,), _ = mock_sleep.call_args
+        self.assertLessEqual(wait, RETRY_MAX_SEC)
 
     def test_missing_from_number_returns_false(self):
-        from alerts.sms import send_sms
-        mock_client = MagicMock()
         env = {k: v for k, v in os.environ.items() if k != "TWILIO_FROM_NUMBER"}
         with patch.dict(os.environ, env, clear=True):
-            ok, detail = send_sms("+18605550001", "Hello", client=mock_client)
+            ok, detail = send_sms("+18605550001", "Hello", client=self.twilio)
         self.assertFalse(ok)
 
+    def test_bulk_preserves_order(self):
+        pairs = [(f"+1860555{i:04d}", f"msg {i}") for i in range(5)]
+        results = send_sms_bulk(pairs, dry_run=True)
+        self.assertEqual(results, [(True, "dry_run")] * 5)
+
+    def test_bulk_reports_rate_limited_failures(self):
+        pairs = [(f"+1860555{i:04d}", "Hello") for i in range(6)]
+        calls = []
+        def fake_send(to, msg, dry_run, client, pacer):
+            calls.append(to)
+            return (False, "failed: HTTP 429", True) if len(calls) == 2 else (True, "queued", False)
+        with patch("alerts.sms._send_sms", side_effect=fake_send):
+            results = send_sms_bulk(pairs)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(sum(ok for ok, _ in results), 5)
+
+    def test_bulk_wave_grows_when_clean_and_halves_on_pushback(self):
+        pairs = [(f"+1860555{i:04d}", "Hello") for i in range(10)]
+        waves = []
+
+        class RecordingPool:
+            # Runs each wave inline and notes its size
+            def __init__(self, max_workers):
+                pass
+            def __enter__(self):
+                return self
+            def __exit__(self, *exc):
+                return False
+            def map(self, fn, wave):
+                waves.append(len(wave))
+                return map(fn, wave)
+
+        def fake_send(to, msg, dry_run, client, pacer):
+            # Pushback on the 4th message, which lands in the third wave
+            return (False, "failed", True) if to == pairs[3][0] else (True, "queued", False)
+
+        with patch("alerts.sms.ThreadPoolExecutor", RecordingPool), \
+             patch("alerts.sms._send_sms", side_effect=fake_send):
+            send_sms_bulk(pairs)
+        self.assertEqual(waves, [1, 2, 3, 1, 2, 1])
+
+    def test_pushback_keys_on_status_not_message_text(self):
+        server_error = Exception("HTTP 503")
+        server_error.status = 503
+        self.assertTrue(sms._is_pushback(server_error))
+        # A 5xx-looking number in the text alone is not pushback
+        self.assertFalse(sms._is_pushback(Exception("Unable to create record: +1 555 0100")))
+        self.assertFalse(sms._is_pushback(Exception("timeout")))
+
+    def test_send_goes_through_given_pacer(self):
+        pacer = MagicMock()
+        with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
+            send_sms("+18605550001", "Hello", client=self.twilio, pacer=pacer)
+        pacer.wait.assert_called_once()
+
+    def test_twilio_client_built_once(self):
+        factory = MagicMock()
+        env = {"TWILIO_ACCOUNT_SID": "AC123", "TWILIO_AUTH_TOKEN": "tok"}
+        with patch.object(sms, "_TwilioClient", factory), patch.object(sms, "_CLIENT", None):
+            with patch.dict(os.environ, env):
+                first  = sms._get_twilio_client()
+                second = sms._get_twilio_client()
+        self.assertIs(first, second)
+        factory.assert_called_once_with("AC123", "tok")
+
     def test_mask_phone_number(self):
-        from alerts.sms import _mask
-        self.assertEqual(_mask("+18605551234"), "+1860***1234")
+        self.assertEqual(mask_phone("+18605551234"), "+1860***1234")
 
     def test_dry_run_does_not_call_client(self):
-        from alerts.sms import send_sms
-        mock_client = MagicMock()
-        send_sms("+18605550001", "Hello", dry_run=True, client=mock_client)
-        mock_client.messages.create.assert_not_called()
+        send_sms("+18605550001", "Hello", dry_run=True, client=self.twilio)
+        self.twilio.messages.create.assert_not_called()
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.limiter = sms.RateLimiter(per_sec=2)
+        # Frozen clock: every wait() after the first has to sleep out its slot
+        patcher = patch("alerts.sms.time.monotonic", return_value=100.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_waits_are_spaced_by_interval(self):
+        with patch("alerts.sms.time.sleep") as mock_sleep:
+            for _ in range(3):
+                self.limiter.wait()
+        self.assertEqual(mock_sleep.call_args_list, [((0.5,),), ((1.0,),)])
+
+    def test_sleeps_outside_the_lock(self):
+        held = []
+        with patch("alerts.sms.time.sleep", side_effect=lambda _: held.append(self.limiter._lock.locked())):
+            self.limiter.wait()
+            self.limiter.wait()
+        self.assertEqual(held, [False])
+
+    def test_reset_clears_pending_slots(self):
+        with patch("alerts.sms.time.sleep") as mock_sleep:
+            self.limiter.wait()
+            self.limiter.reset()
+            self.limiter.wait()
+        mock_sleep.assert_not_called()
 
 
 # ══════════════════════════════════════════════════════════
 # EMAIL DELIVERY TESTS
 # ══════════════════════════════════════════════════════════
 class TestEmailDelivery(unittest.TestCase):
-    def _sample_payload(self, with_promos=True):
-        return {
-            "game_id": 1,
-            "game_date": "2026-04-10",
-            "display_date": "Fri Apr 10",
-            "day": "Friday",
-            "time": "7:05 PM",
-            "opponent": "Portland Sea Dogs",
-            "ticket_url": "https://milb.com/hartford/tickets",
-            "promo_summary": "🎁 Cowboy Hat Giveaway | 🎆 Fireworks",
-            "promos": [
-                {"promo_type": "giveaway",  "description": "Cowboy Hat Giveaway"},
-                {"promo_type": "fireworks", "description": "Post-game fireworks"},
-            ] if with_promos else [],
-            "has_promos": with_promos,
-        }
-
     def test_dry_run_returns_success(self):
-        from alerts.email_sender import send_email
         ok, detail = send_email(
-            "alice@test.com", "Subject", self._sample_payload(), dry_run=True
+            "alice@test.com", "Subject", _EMAIL_PAYLOAD_PROMOS, dry_run=True
         )
         self.assertTrue(ok)
         self.assertEqual(detail, "dry_run")
 
     def test_sends_via_mock_client(self):
-        from alerts.email_sender import send_email
         mock_response = MagicMock()
         mock_response.status_code = 202
         mock_response.body = ""
@@ -404,13 +545,12 @@ class TestEmailDelivery(unittest.TestCase):
         mock_client.send.return_value = mock_response
 
         ok, detail = send_email(
-            "alice@test.com", "Subject", self._sample_payload(), client=mock_client
+            "alice@test.com", "Subject", _EMAIL_PAYLOAD_PROMOS, client=mock_client
         )
         self.assertTrue(ok)
         mock_client.send.assert_called_once()
 
     def test_returns_false_on_bad_status(self):
-        from alerts.email_sender import send_email
         mock_response = MagicMock()
         mock_response.status_code = 500
         mock_response.body = "Internal error"
@@ -418,57 +558,61 @@ class TestEmailDelivery(unittest.TestCase):
         mock_client.send.return_value = mock_response
 
         ok, detail = send_email(
-            "alice@test.com", "Subject", self._sample_payload(), client=mock_client
+            "alice@test.com", "Subject", _EMAIL_PAYLOAD_PROMOS, client=mock_client
         )
         self.assertFalse(ok)
 
     def test_returns_false_on_exception(self):
-        from alerts.email_sender import send_email
         mock_client = MagicMock()
         mock_client.send.side_effect = Exception("connection reset")
         ok, detail = send_email(
-            "alice@test.com", "Subject", self._sample_payload(), client=mock_client
+            "alice@test.com", "Subject", _EMAIL_PAYLOAD_PROMOS, client=mock_client
         )
         self.assertFalse(ok)
 
+    def test_uses_prerendered_html_body(self):
+        mock_response = MagicMock()
+        mock_response.status_code = 202
+        mock_client = MagicMock()
+        mock_client.send.return_value = mock_response
+
+        with patch("alerts.email_sender.render_alert_html") as mock_render:
+            ok, _ = send_email("alice@test.com", "Subject", _EMAIL_PAYLOAD_PROMOS,
+                               client=mock_client, html_body="<p>prebuilt</p>")
+        self.assertTrue(ok)
+        mock_render.assert_not_called()
+
     def test_dry_run_does_not_call_client(self):
-        from alerts.email_sender import send_email
         mock_client = MagicMock()
-        send_email("alice@test.com", "Sub", self._sample_payload(),
+        send_email("alice@test.com", "Sub", _EMAIL_PAYLOAD_PROMOS,
                    dry_run=True, client=mock_client)
         mock_client.send.assert_not_called()
 
     def test_mask_email(self):
-        from alerts.email_sender import _mask
-        self.assertEqual(_mask("alice@test.com"), "al***@test.com")
+        self.assertEqual(mask_email("alice@test.com"), "al***@test.com")
 
     def test_mask_short_email(self):
-        from alerts.email_sender import _mask
-        self.assertEqual(_mask("a@b.com"), "***@b.com")
+        self.assertEqual(mask_email("a@b.com"), "***@b.com")
 
     def test_template_renders_game_info(self):
-        from alerts.email_sender import _render_template
-        html = _render_template(self._sample_payload())
+        html = render_alert_html(_EMAIL_PAYLOAD_PROMOS)
         self.assertIn("Portland Sea Dogs", html)
         self.assertIn("7:05 PM", html)
         self.assertIn("Fri Apr 10", html)
         self.assertIn("milb.com", html)
 
     def test_template_renders_promo_badges(self):
-        from alerts.email_sender import _render_template
-        html = _render_template(self._sample_payload(with_promos=True))
+        html = render_alert_html(_EMAIL_PAYLOAD_PROMOS)
         self.assertIn("Cowboy Hat Giveaway", html)
         self.assertIn("badge-giveaway", html)
 
     def test_template_renders_tbd_when_no_promos(self):
-        from alerts.email_sender import _render_template
-        html = _render_template(self._sample_payload(with_promos=False))
+        html = render_alert_html(_EMAIL_PAYLOAD_NO_PROMOS)
         self.assertIn("badge-tbd", html)
         self.assertIn("Promotions TBD", html)
 
     def test_template_contains_ticket_cta(self):
-        from alerts.email_sender import _render_template
-        html = _render_template(self._sample_payload())
+        html = render_alert_html(_EMAIL_PAYLOAD_PROMOS)
         self.assertIn("Get Tickets", html)
         self.assertIn("milb.com/hartford/tickets", html)
 
@@ -477,84 +621,82 @@ class TestEmailDelivery(unittest.TestCase):
 # FULL PIPELINE INTEGRATION TESTS
 # ══════════════════════════════════════════════════════════
 class TestAlertPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # No real backoff/pacing sleeps and a sender number for every test
+        cls._patches = [
+            patch("alerts.sms.time.sleep"),
+            patch("alerts.sms._PACER"),
+            patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}),
+        ]
+        for p in cls._patches:
+            p.start()
+        # Schema copied once per class; tests are isolated by clear_tables
+        cls.db = make_memory_db()
+        cls.sms_ok   = make_sms_client()
+        cls.sms_fail = make_sms_client(success=False)
+        cls.email_ok = make_email_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_memory_db()
+        for p in reversed(cls._patches):
+            p.stop()
+
     def setUp(self):
-        self.db = make_tmp_db()
-        from admin.db import get_conn
-        self.get_conn = get_conn
         # Friday game 5 days from "today" in tests
         self.today       = date(2026, 4, 5)   # Sunday
         self.game_date   = date(2026, 4, 10)  # Friday (today + 5)
 
     def tearDown(self):
-        teardown_tmp_db(self.db)
-
-    def _mock_sms(self, success=True):
-        m = MagicMock()
-        msg = MagicMock()
-        msg.sid    = "SM_TEST"
-        msg.status = "delivered" if success else "failed"
-        if success:
-            m.messages.create.return_value = msg
-        else:
-            m.messages.create.side_effect = Exception("fail")
-        return m
-
-    def _mock_email(self, status_code=202):
-        m = MagicMock()
-        resp = MagicMock()
-        resp.status_code = status_code
-        resp.body = ""
-        m.send.return_value = resp
-        return m
+        clear_tables(self.db)
+        # Shared mocks: drop call history, keep configured responses
+        for client in (self.sms_ok, self.sms_fail, self.email_ok):
+            client.reset_mock()
 
     def test_full_pipeline_sends_sms_and_email(self):
-        from alerts.main import run
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             insert_recipient(conn, "Alice", "+18605550001", "alice@test.com")
 
-        with patch("alerts.sms.time.sleep"):
-            with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
-                stats = run(
-                    today=self.today,
-                    dry_run=False,
-                    sms_client=self._mock_sms(),
-                    email_client=self._mock_email(),
-                )
+        stats = run(
+            today=self.today,
+            dry_run=False,
+            sms_client=self.sms_ok,
+            email_client=self.email_ok,
+            db_path=self.db,
+        )
 
         self.assertEqual(stats["sms_sent"],   1)
         self.assertEqual(stats["email_sent"], 1)
         self.assertEqual(stats["sms_failed"], 0)
 
     def test_deduplication_prevents_double_send(self):
-        from alerts.main import run
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             insert_recipient(conn, "Alice", "+18605550001", "alice@test.com")
 
-        sms_client   = self._mock_sms()
-        email_client = self._mock_email()
+        sms_client   = self.sms_ok
+        email_client = self.email_ok
 
-        with patch("alerts.sms.time.sleep"):
-            with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
-                run(today=self.today, sms_client=sms_client, email_client=email_client)
-                # Run again — should be deduped
-                stats2 = run(today=self.today, sms_client=sms_client, email_client=email_client)
+        run(today=self.today, sms_client=sms_client, email_client=email_client, db_path=self.db)
+        # Run again — should be deduped
+        stats2 = run(today=self.today, sms_client=sms_client, email_client=email_client, db_path=self.db)
 
         self.assertEqual(stats2["sms_sent"],  0)
         self.assertEqual(stats2["skipped"],   2)  # 1 SMS + 1 email skipped
 
     def test_dry_run_sends_nothing(self):
-        from alerts.main import run
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             insert_recipient(conn, "Alice", "+18605550001", "alice@test.com")
 
-        sms_client   = self._mock_sms()
-        email_client = self._mock_email()
+        sms_client   = self.sms_ok
+        email_client = self.email_ok
 
         stats = run(today=self.today, dry_run=True,
-                    sms_client=sms_client, email_client=email_client)
+                    sms_client=sms_client, email_client=email_client,
+                    db_path=self.db)
 
         sms_client.messages.create.assert_not_called()
         email_client.send.assert_not_called()
@@ -563,132 +705,148 @@ class TestAlertPipeline(unittest.TestCase):
         self.assertEqual(stats["email_sent"], 1)
 
     def test_no_games_returns_zero_stats(self):
-        from alerts.main import run
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_recipient(conn, "Alice", "+18605550001", "alice@test.com")
-        stats = run(today=self.today)
+        stats = run(today=self.today, db_path=self.db)
         self.assertEqual(stats["games_checked"], 0)
         self.assertEqual(stats["alerts_sent"],   0)
 
     def test_no_recipients_returns_zero_stats(self):
-        from alerts.main import run
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
-        stats = run(today=self.today)
+        stats = run(today=self.today, db_path=self.db)
         self.assertEqual(stats["alerts_sent"], 0)
 
     def test_tuesday_game_not_alerted(self):
-        from alerts.main import run
         # today=Apr 7 (Wed), target=Apr 12 (Mon) — not a Fri/Sat/Sun
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-12", "Monday")
             insert_recipient(conn)
-        stats = run(today=date(2026, 4, 7))
+        stats = run(today=date(2026, 4, 7), db_path=self.db)
         self.assertEqual(stats["games_checked"], 0)
 
     def test_sms_failure_email_still_sends(self):
-        from alerts.main import run
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             insert_recipient(conn, "Alice", "+18605550001", "alice@test.com")
 
-        with patch("alerts.sms.time.sleep"):
-            with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
-                stats = run(
-                    today=self.today,
-                    sms_client=self._mock_sms(success=False),
-                    email_client=self._mock_email(),
-                )
+        stats = run(
+            today=self.today,
+            sms_client=self.sms_fail,
+            email_client=self.email_ok,
+            db_path=self.db,
+        )
 
         # Email still succeeds even when SMS fails
         self.assertEqual(stats["email_sent"], 1)
         self.assertEqual(stats["sms_failed"], 1)
 
     def test_phone_only_recipient_no_email_attempt(self):
-        from alerts.main import run
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             insert_recipient(conn, "PhoneOnly", "+18605550001", None)
 
-        email_client = self._mock_email()
-        with patch("alerts.sms.time.sleep"):
-            with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
-                stats = run(today=self.today,
-                            sms_client=self._mock_sms(),
-                            email_client=email_client)
+        email_client = self.email_ok
+        stats = run(today=self.today,
+                    sms_client=self.sms_ok,
+                    email_client=email_client,
+                    db_path=self.db)
 
         email_client.send.assert_not_called()
         self.assertEqual(stats["sms_sent"], 1)
 
     def test_email_only_recipient_no_sms_attempt(self):
-        from alerts.main import run
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             insert_recipient(conn, "EmailOnly", None, "email@test.com")
 
-        sms_client = self._mock_sms()
+        sms_client = self.sms_ok
         stats = run(today=self.today,
                     sms_client=sms_client,
-                    email_client=self._mock_email())
+                    email_client=self.email_ok,
+                    db_path=self.db)
 
         sms_client.messages.create.assert_not_called()
         self.assertEqual(stats["email_sent"], 1)
 
     def test_multiple_recipients_all_alerted(self):
-        from alerts.main import run
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
-            for i in range(5):
-                insert_recipient(conn, f"Person{i}",
-                                 f"+1860555{i:04d}", f"p{i}@test.com")
+            insert_recipients_bulk(conn, [
+                (f"Person{i}", f"+1860555{i:04d}", f"p{i}@test.com") for i in range(5)
+            ])
 
-        with patch("alerts.sms.time.sleep"):
-            with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
-                stats = run(today=self.today,
-                            sms_client=self._mock_sms(),
-                            email_client=self._mock_email())
+        stats = run(today=self.today,
+                    sms_client=self.sms_ok,
+                    email_client=self.email_ok,
+                    db_path=self.db)
 
         self.assertEqual(stats["sms_sent"],   5)
         self.assertEqual(stats["email_sent"], 5)
 
     def test_stale_data_skips_all_alerts(self):
-        from alerts.main import run
-        with self.get_conn(self.db) as conn:
-            # Insert stale game (3 days ago updated_at)
-            conn.execute("""
-                INSERT INTO games (game_date, day_of_week, start_time, opponent,
-                                   is_home, ticket_url, updated_at)
-                VALUES ('2026-04-10','Friday','7:05 PM','Sea Dogs',1,NULL,
-                        datetime('now','-3 days'))
-            """)
+        with get_conn(self.db) as conn:
+            insert_stale_game(conn)
             insert_recipient(conn)
 
-        sms_client = self._mock_sms()
-        stats = run(today=self.today, sms_client=sms_client, email_client=self._mock_email())
+        sms_client = self.sms_ok
+        stats = run(today=self.today, sms_client=sms_client, email_client=self.email_ok, db_path=self.db)
 
         sms_client.messages.create.assert_not_called()
         self.assertEqual(stats["alerts_sent"], 0)
 
     def test_delivery_logged_to_db(self):
-        from alerts.main import run
-        from admin.db import get_alert_log
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             insert_game(conn, "2026-04-10", "Friday")
             insert_recipient(conn)
 
-        with patch("alerts.sms.time.sleep"):
-            with patch.dict(os.environ, {"TWILIO_FROM_NUMBER": "+18605550000"}):
-                run(today=self.today,
-                    sms_client=self._mock_sms(),
-                    email_client=self._mock_email())
+        run(today=self.today,
+            sms_client=self.sms_ok,
+            email_client=self.email_ok,
+            db_path=self.db)
 
-        with self.get_conn(self.db) as conn:
+        with get_conn(self.db) as conn:
             logs = get_alert_log(conn)
         # 1 SMS + 1 email = 2 log entries
         self.assertEqual(len(logs), 2)
         statuses = {l["status"] for l in logs}
         self.assertEqual(statuses, {"delivered"})
 
+    def test_no_write_transaction_held_during_sends(self):
+        with get_conn(self.db) as conn:
+            insert_game(conn, "2026-04-10", "Friday")
+            insert_recipient(conn)
+        in_txn = []
+
+        def send_pool(**kwargs):
+            # Sends run inside this pool — note the DB state as they start
+            with get_conn(self.db) as conn:
+                in_txn.append(conn.in_transaction)
+            return ThreadPoolExecutor(**kwargs)
+
+        with patch("alerts.main.ThreadPoolExecutor", side_effect=send_pool):
+            run(today=self.today, sms_client=self.sms_ok, email_client=self.email_ok, db_path=self.db)
+        self.assertEqual(in_txn, [False])
+
+
+
+class TestAlertMainCLI(unittest.TestCase):
+    STATS = {"sms_failed": 0, "email_failed": 0, "alerts_sent": 0}
+
+    def _main(self, argv):
+        with patch("alerts.main.run", return_value=self.STATS) as mock_run:
+            with patch("sys.argv", ["main.py"] + argv):
+                with self.assertRaises(SystemExit):
+                    main()
+        return mock_run.call_args.kwargs
+
+    def test_dry_run_fast_path(self):
+        self.assertEqual(self._main(["--dry-run"]), {"today": None, "dry_run": True})
+
+    def test_date_override_uses_argparse(self):
+        kwargs = self._main(["--date", "2026-04-05"])
+        self.assertEqual(kwargs, {"today": date(2026, 4, 5), "dry_run": False})
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
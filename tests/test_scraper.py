@@ -8,117 +8,154 @@ import json
 import os
 import sys
 import unittest
-from datetime import date
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-sys.path.insert(0, str(Path(__file__).parent.parent / "data"))
+# No pyproject/editable install — add the repo root and data/ once each
+for _path in (str(Path(__file__).parent.parent), str(Path(__file__).parent.parent / "data")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import lxml.html
+import requests
+from admin.db import get_conn
+from scraper.schedule import _parse_api_response, _parse_datetime, _parse_game, fetch_schedule
+from scraper.promotions import fetch_promotions, classify_promo, _parse_date_from_text, BS4_PARSER
+from scraper.main import run
+from _dbutil import MEMORY_DB, make_memory_db, teardown_memory_db, clear_tables
 
 FIXTURES = Path(__file__).parent / "fixtures"
 
 
+@lru_cache(maxsize=None)
+def _load_text(name: str) -> str:
+    """Read a fixture file once per process."""
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=None)
+def _load_json(name: str):
+    """Decode a JSON fixture once per process — treat the result as read-only."""
+    return json.loads(_load_text(name))
+
+
+class _FakeResp:
+    """
+    Plain 200 response holding the body as bytes. Every decode builds a
+    fresh object, so a scraper that mutates its input can't leak into
+    later tests through the shared fixture.
+    """
+
+    def __init__(self, data):
+        self.content = json.dumps(data).encode()
+        self.headers = {"Content-Type": "application/json; charset=utf-8"}
+        self.encoding = "utf-8"
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        pass
+
+
+def _mock_session(api_data):
+    """A requests.Session stand-in whose get() returns the schedule fixture."""
+    session = MagicMock()
+    session.get.return_value = _FakeResp(api_data)
+    return session
+
+
 # ══════════════════════════════════════════════════════════
 # SCHEDULE PARSER TESTS
 # ══════════════════════════════════════════════════════════
 class TestScheduleParser(unittest.TestCase):
-    def setUp(self):
-        self.api_data = json.loads(
-            (FIXTURES / "mlb_api_schedule.json").read_text()
-        )
-        from scraper.schedule import _parse_api_response, _parse_datetime, _parse_game
-        self.parse_api_response = _parse_api_response
-        self.parse_datetime     = _parse_datetime
-        self.parse_game         = _parse_game
+    @classmethod
+    def setUpClass(cls):
+        cls.api_data = _load_json("mlb_api_schedule.json")
+        cls.session  = _mock_session(cls.api_data)
+        # Parsed once — the read-only tests below all inspect the same result
+        cls.games    = _parse_api_response(cls.api_data)
+
+    def tearDown(self):
+        self.session.get.reset_mock(side_effect=True)
 
     def test_parse_returns_home_games_only(self):
-        games = self.parse_api_response(self.api_data)
         # Fixture has 5 home games + 1 away game
-        self.assertEqual(len(games), 5)
-        for g in games:
+        self.assertEqual(len(self.games), 5)
+        for g in self.games:
             self.assertEqual(g["is_home"], 1)
 
-    def test_friday_game_parsed(self):
-        games = self.parse_api_response(self.api_data)
-        fri = next(g for g in games if g["game_date"] == "2026-04-10")
-        self.assertEqual(fri["day_of_week"], "Friday")
+    # (game_date, day_of_week) for the fixture's home games
+    GAME_DAY_CASES = [
+        ("2026-04-10", "Friday"),
+        ("2026-04-11", "Saturday"),
+        ("2026-04-12", "Sunday"),
+        ("2026-04-14", "Tuesday"),
+    ]
+
+    def test_game_days_parsed(self):
+        games = {g["game_date"]: g for g in self.games}
+        for game_date, day in self.GAME_DAY_CASES:
+            with self.subTest(game_date):
+                self.assertEqual(games[game_date]["day_of_week"], day)
+
+    def test_friday_game_opponent(self):
+        fri = next(g for g in self.games if g["game_date"] == "2026-04-10")
         self.assertEqual(fri["opponent"], "Portland Sea Dogs")
 
-    def test_saturday_game_parsed(self):
-        games = self.parse_api_response(self.api_data)
-        sat = next(g for g in games if g["game_date"] == "2026-04-11")
-        self.assertEqual(sat["day_of_week"], "Saturday")
-
-    def test_sunday_game_parsed(self):
-        games = self.parse_api_response(self.api_data)
-        sun = next(g for g in games if g["game_date"] == "2026-04-12")
-        self.assertEqual(sun["day_of_week"], "Sunday")
-
-    def test_tuesday_game_parsed(self):
-        games = self.parse_api_response(self.api_data)
-        tue = next(g for g in games if g["game_date"] == "2026-04-14")
-        self.assertEqual(tue["day_of_week"], "Tuesday")
-
     def test_away_game_excluded(self):
-        games = self.parse_api_response(self.api_data)
-        dates = [g["game_date"] for g in games]
+        dates = [g["game_date"] for g in self.games]
         self.assertNotIn("2026-04-28", dates)
 
     def test_all_required_fields_present(self):
-        games = self.parse_api_response(self.api_data)
         required = {"game_date","day_of_week","start_time","opponent","is_home","ticket_url"}
-        for g in games:
+        for g in self.games:
             self.assertEqual(required, set(g.keys()))
 
     def test_parse_datetime_evening_game(self):
         # 23:05 UTC → 19:05 ET (7:05 PM)
-        date_str, time_str = self.parse_datetime("2026-04-10T23:05:00Z")
+        date_str, time_str = _parse_datetime("2026-04-10T23:05:00Z")
         self.assertEqual(date_str, "2026-04-10")
         self.assertEqual(time_str, "7:05 PM")
 
     def test_parse_datetime_afternoon_game(self):
         # 17:05 UTC → 13:05 ET (1:05 PM)
-        date_str, time_str = self.parse_datetime("2026-04-12T17:05:00Z")
+        date_str, time_str = _parse_datetime("2026-04-12T17:05:00Z")
         self.assertEqual(date_str, "2026-04-12")
         self.assertEqual(time_str, "1:05 PM")
 
     def test_parse_datetime_empty_string(self):
-        date_str, time_str = self.parse_datetime("")
+        date_str, time_str = _parse_datetime("")
         self.assertEqual(date_str, "")
         self.assertEqual(time_str, "")
 
+    def test_parse_datetime_date_only(self):
+        date_str, time_str = _parse_datetime("2026-04-10")
+        self.assertEqual(date_str, "2026-04-10")
+        self.assertEqual(time_str, "")
+
     def test_parse_game_skips_malformed(self):
-        result = self.parse_game({"gamePk": 999})
+        result = _parse_game({"gamePk": 999})
         self.assertIsNone(result)
 
     def test_fetch_schedule_uses_requests(self):
         """fetch_schedule wires up requests correctly."""
-        from scraper.schedule import fetch_schedule
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = self.api_data
-        mock_resp.raise_for_status.return_value = None
-
-        mock_session = MagicMock()
-        mock_session.get.return_value = mock_resp
-
-        games = fetch_schedule(season=2026, session=mock_session)
+        games = fetch_schedule(season=2026, session=self.session)
         self.assertEqual(len(games), 5)
-        mock_session.get.assert_called_once()
-        call_args = mock_session.get.call_args
+        self.session.get.assert_called_once()
+        call_args = self.session.get.call_args
         self.assertIn("schedule", call_args[0][0])
 
     def test_fetch_schedule_raises_on_http_error(self):
         """fetch_schedule propagates request exceptions."""
-        import requests as req
-        from scraper.schedule import fetch_schedule
-        mock_session = MagicMock()
-        mock_session.get.side_effect = req.RequestException("timeout")
-        with self.assertRaises(req.RequestException):
-            fetch_schedule(season=2026, session=mock_session)
+        self.session.get.side_effect = requests.RequestException("timeout")
+        with self.assertRaises(requests.RequestException):
+            fetch_schedule(season=2026, session=self.session)
 
     def test_ticket_url_present(self):
-        games = self.parse_api_response(self.api_data)
-        for g in games:
+        for g in self.games:
             self.assertIsNotNone(g["ticket_url"])
             self.assertIn("milb.com", g["ticket_url"])
 
@@ -127,245 +164,231 @@ class TestScheduleParser(unittest.TestCase):
 # PROMOTIONS PARSER TESTS
 # ══════════════════════════════════════════════════════════
 class TestPromotionsParser(unittest.TestCase):
-    def setUp(self):
-        self.html = (FIXTURES / "promotions_page.html").read_text()
-        from scraper.promotions import fetch_promotions, classify_promo, _parse_date_from_text
-        self.fetch_promotions    = fetch_promotions
-        self.classify_promo      = classify_promo
-        self.parse_date_from_text = _parse_date_from_text
+    @classmethod
+    def setUpClass(cls):
+        cls.html   = _load_text("promotions_page.html")
+        # Parse the page once; the read-only tests share the result
+        cls.tree   = lxml.html.fromstring(cls.html)
+        cls.result = fetch_promotions(tree=cls.tree)
 
     def test_returns_dict(self):
-        result = self.fetch_promotions(html=self.html)
-        self.assertIsInstance(result, dict)
+        self.assertIsInstance(self.result, dict)
 
     def test_detects_giveaway_game(self):
-        result = self.fetch_promotions(html=self.html)
-        self.assertIn("2026-04-10", result)
-        types = {p["promo_type"] for p in result["2026-04-10"]}
+        self.assertIn("2026-04-10", self.result)
+        types = {p["promo_type"] for p in self.result["2026-04-10"]}
         self.assertIn("giveaway", types)
 
     def test_detects_fireworks_game(self):
-        result = self.fetch_promotions(html=self.html)
-        self.assertIn("2026-04-10", result)
-        types = {p["promo_type"] for p in result["2026-04-10"]}
+        self.assertIn("2026-04-10", self.result)
+        types = {p["promo_type"] for p in self.result["2026-04-10"]}
         self.assertIn("fireworks", types)
 
     def test_detects_discount_game(self):
-        result = self.fetch_promotions(html=self.html)
-        self.assertIn("2026-06-07", result)
-        types = {p["promo_type"] for p in result["2026-06-07"]}
+        self.assertIn("2026-06-07", self.result)
+        types = {p["promo_type"] for p in self.result["2026-06-07"]}
         self.assertIn("discount", types)
 
     def test_detects_theme_night(self):
-        result = self.fetch_promotions(html=self.html)
-        self.assertIn("2026-05-04", result)
-        types = {p["promo_type"] for p in result["2026-05-04"]}
+        self.assertIn("2026-05-04", self.result)
+        types = {p["promo_type"] for p in self.result["2026-05-04"]}
         # Star Wars Night → theme
         self.assertIn("theme", types)
 
     def test_detects_heritage_night(self):
-        result = self.fetch_promotions(html=self.html)
-        self.assertIn("2026-08-01", result)
-        types = {p["promo_type"] for p in result["2026-08-01"]}
+        self.assertIn("2026-08-01", self.result)
+        types = {p["promo_type"] for p in self.result["2026-08-01"]}
         self.assertIn("heritage", types)
 
+    def test_non_ascii_description_preserved(self):
+        result = fetch_promotions(html=self.html)
+        self.assertEqual(result["2026-08-15"][0]["description"], "Café Night")
+
     def test_promo_descriptions_nonempty(self):
-        result = self.fetch_promotions(html=self.html)
-        for date_str, promos in result.items():
+        for date_str, promos in self.result.items():
             for p in promos:
                 self.assertGreater(len(p["description"]), 3)
 
     def test_all_promos_have_valid_type(self):
         valid_types = {"giveaway","fireworks","discount","theme","heritage","special"}
-        result = self.fetch_promotions(html=self.html)
-        for date_str, promos in result.items():
+        for date_str, promos in self.result.items():
             for p in promos:
                 self.assertIn(p["promo_type"], valid_types)
 
     def test_empty_html_returns_empty_dict(self):
-        result = self.fetch_promotions(html="<html><body></body></html>")
+        result = fetch_promotions(html="<html><body></body></html>")
         self.assertEqual(result, {})
 
+    def test_uses_lxml_parser(self):
+        # lxml is a declared dependency — guard against a silent fallback
+        # to html.parser and to the slower BeautifulSoup path
+        self.assertEqual(BS4_PARSER, "lxml")
+        with patch("scraper.promotions.BeautifulSoup") as soup:
+            result = fetch_promotions(html=self.html)
+        soup.assert_not_called()
+        self.assertIn("2026-04-10", result)
 
-class TestPromotionClassifier(unittest.TestCase):
-    def setUp(self):
-        from scraper.promotions import classify_promo
-        self.classify = classify_promo
-
-    def test_hat_is_giveaway(self):
-        self.assertEqual(self.classify("Cowboy Hat Giveaway"), "giveaway")
-
-    def test_jersey_is_giveaway(self):
-        self.assertEqual(self.classify("Vintage Delivery Driver Jersey Giveaway"), "giveaway")
-
-    def test_fireworks_classified(self):
-        self.assertEqual(self.classify("Post-Game Fireworks Show"), "fireworks")
-
-    def test_dollar_is_discount(self):
-        self.assertEqual(self.classify("$1 Hot Dog Night"), "discount")
-
-    def test_discount_keyword(self):
-        self.assertEqual(self.classify("Discount Tuesday – reduced tickets"), "discount")
+    def test_tree_matches_html(self):
+        self.assertEqual(self.result, fetch_promotions(html=self.html))
 
-    def test_star_wars_is_theme(self):
-        self.assertEqual(self.classify("Star Wars Night"), "theme")
+    def test_bytes_html_decoded_with_given_encoding(self):
+        # The fixture has no <meta charset>, so only `encoding` says it is UTF-8
+        result = fetch_promotions(html=self.html.encode(), encoding="utf-8")
+        self.assertEqual(result["2026-08-15"][0]["description"], "Café Night")
 
-    def test_90s_night_is_theme(self):
-        self.assertEqual(self.classify("90s Night with DJ"), "theme")
+    def _fetch_via(self, html, headers, encoding):
+        resp = MagicMock(content=html.encode(), headers=headers, encoding=encoding)
+        session = MagicMock(headers={})
+        session.get.return_value = resp
+        return fetch_promotions(session=session)
 
-    def test_whalers_is_heritage(self):
-        self.assertEqual(self.classify("Hartford Whalers Heritage Night"), "heritage")
+    def test_fetch_uses_header_charset(self):
+        result = self._fetch_via(
+            self.html, {"Content-Type": "text/html; charset=utf-8"}, "utf-8",
+        )
+        self.assertEqual(result["2026-08-15"][0]["description"], "Café Night")
 
-    def test_unknown_is_special(self):
-        self.assertEqual(self.classify("First pitch ceremony"), "special")
+    def test_fetch_reads_meta_charset_when_header_has_none(self):
+        # requests reports Latin-1 for a bare text/html — the page's own
+        # <meta charset> must win over it
+        html = self.html.replace("<html>", '<html><head><meta charset="utf-8"></head>', 1)
+        result = self._fetch_via(html, {"Content-Type": "text/html"}, "ISO-8859-1")
+        self.assertEqual(result["2026-08-15"][0]["description"], "Café Night")
 
-    def test_fanny_pack_is_giveaway(self):
-        self.assertEqual(self.classify("Fanny Pack Hat Giveaway"), "giveaway")
 
-    def test_crocs_is_giveaway(self):
-        self.assertEqual(self.classify("Crocs Hat Giveaway"), "giveaway")
+class TestPromotionClassifier(unittest.TestCase):
+    CLASSIFY_CASES = [
+        ("Cowboy Hat Giveaway",                     "giveaway"),
+        ("Vintage Delivery Driver Jersey Giveaway", "giveaway"),
+        ("Fanny Pack Hat Giveaway",                 "giveaway"),
+        ("Crocs Hat Giveaway",                      "giveaway"),
+        ("Post-Game Fireworks Show",                "fireworks"),
+        ("$1 Hot Dog Night",                        "discount"),
+        ("Discount Tuesday – reduced tickets",      "discount"),
+        ("Star Wars Night",                         "theme"),
+        ("90s Night with DJ",                       "theme"),
+        ("Hartford Whalers Heritage Night",         "heritage"),
+        ("First pitch ceremony",                    "special"),
+        # Rule order wins over position in the text
+        ("Star Wars Night Bobblehead",              "giveaway"),
+    ]
+
+    def test_classifications(self):
+        for text, expected in self.CLASSIFY_CASES:
+            with self.subTest(text):
+                self.assertEqual(classify_promo(text), expected)
 
 
 class TestDateParser(unittest.TestCase):
-    def setUp(self):
-        from scraper.promotions import _parse_date_from_text
-        self.parse = _parse_date_from_text
-
-    def test_full_date_with_year(self):
-        result = self.parse("Friday, April 10, 2026")
-        self.assertEqual(result, "2026-04-10")
-
-    def test_short_month_with_year(self):
-        result = self.parse("Apr 10, 2026")
-        self.assertEqual(result, "2026-04-10")
-
-    def test_iso_format(self):
-        result = self.parse("2026-04-10")
-        self.assertEqual(result, "2026-04-10")
-
-    def test_slash_format(self):
-        result = self.parse("04/10/2026")
-        self.assertEqual(result, "2026-04-10")
-
-    def test_no_date_returns_none(self):
-        result = self.parse("Post-Game Fireworks Show")
-        self.assertIsNone(result)
-
-    def test_date_in_sentence(self):
-        result = self.parse("Join us Saturday, May 4, 2026 for Star Wars Night!")
-        self.assertEqual(result, "2026-05-04")
+    DATE_CASES = [
+        ("Friday, April 10, 2026",                              "2026-04-10"),
+        ("Apr 10, 2026",                                        "2026-04-10"),
+        ("2026-04-10",                                          "2026-04-10"),
+        ("04/10/2026",                                          "2026-04-10"),
+        ("Join us Saturday, May 4, 2026 for Star Wars Night!", "2026-05-04"),
+        ("Post-Game Fireworks Show",                            None),
+        # Format order wins over position in the text
+        ("Tickets 04/10/2026 or Apr 12, 2026",                  "2026-04-12"),
+    ]
+
+    def test_dates(self):
+        for text, expected in self.DATE_CASES:
+            with self.subTest(text):
+                self.assertEqual(_parse_date_from_text(text), expected)
+
+    def test_yearless_date_follows_the_clock(self):
+        # Cached results must not carry last year's date past Jan 1
+        with patch("scraper.promotions.datetime") as mock_dt:
+            mock_dt.strptime = datetime.strptime
+            for year in (2026, 2027):
+                mock_dt.now.return_value = datetime(year, 1, 1)
+                with self.subTest(year=year):
+                    self.assertEqual(_parse_date_from_text("Friday, April 10"), f"{year}-04-10")
 
 
 # ══════════════════════════════════════════════════════════
 # MAIN PIPELINE INTEGRATION TEST
 # ══════════════════════════════════════════════════════════
 class TestScraperMain(unittest.TestCase):
-    def setUp(self):
-        import tempfile
-        self.tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
-        self.tmp.close()
-        os.environ["YARDGOATS_DB"] = self.tmp.name
-        from admin.db import init_db
-        init_db(Path(self.tmp.name))
-
-        self.api_data    = json.loads((FIXTURES / "mlb_api_schedule.json").read_text())
-        self.promos_html = (FIXTURES / "promotions_page.html").read_text()
+    @classmethod
+    def setUpClass(cls):
+        cls.api_data    = _load_json("mlb_api_schedule.json")
+        cls.promos_html = _load_text("promotions_page.html")
+        cls.session     = _mock_session(cls.api_data)
+        # scraper.main.run() resolves the DB from $YARDGOATS_DB; point it at
+        # one shared in-memory DB for the class, emptied after each test
+        cls._patches = [
+            patch.dict(os.environ, {"YARDGOATS_DB": str(MEMORY_DB)}),
+            # build_session() gets the prebuilt mock for every test
+            patch("scraper.schedule.requests.Session", return_value=cls.session),
+            # The mock session only serves the schedule JSON; the promotions
+            # page comes from its fixture so every run parses real promos
+            patch("scraper.promotions._fetch_html",
+                  return_value=(cls.promos_html.encode(), "utf-8")),
+        ]
+        for p in cls._patches:
+            p.start()
+        cls.db_path = make_memory_db()
+
+        # The happy path runs once; its tests only inspect what it wrote
+        cls.run_result = run(season=2026, dry_run=False)
+        with get_conn(cls.db_path) as conn:
+            cls.games_count, cls.promo_count = conn.execute(
+                "SELECT (SELECT COUNT(*) FROM games), (SELECT COUNT(*) FROM promotions)"
+            ).fetchone()
+        cls.session.get.reset_mock()
+        clear_tables(cls.db_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        teardown_memory_db()
+        for p in reversed(cls._patches):
+            p.stop()
 
     def tearDown(self):
-        if "YARDGOATS_DB" in os.environ:
-            del os.environ["YARDGOATS_DB"]
-        import gc
-        gc.collect()
-        import time
-        time.sleep(0.6)
-        Path(self.tmp.name).unlink(missing_ok=True)
+        self.session.get.reset_mock(side_effect=True)
+        clear_tables(self.db_path)
 
     def test_full_pipeline_dry_run(self):
         """Dry run completes without writing to DB."""
-        from scraper.main import run
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = self.api_data
-        mock_resp.raise_for_status.return_value = None
-        mock_sess = MagicMock()
-        mock_sess.get.return_value = mock_resp
-
-        with patch("scraper.schedule.requests.Session", return_value=mock_sess):
+        with self.assertLogs("scraper.main", "INFO") as logs:
             result = run(season=2026, dry_run=True)
         self.assertTrue(result)
+        # Promotions were parsed, not skipped through the failure branch
+        self.assertIn("Fetched promotions for 5 game dates", "\n".join(logs.output))
+        self.assertFalse(any("Promotions fetch failed" in line for line in logs.output))
 
     def test_full_pipeline_writes_games(self):
         """Live run upserts games to DB."""
-        from scraper.main import run
-        from admin.db import get_conn
-
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = self.api_data
-        mock_resp.raise_for_status.return_value = None
-        mock_sess = MagicMock()
-        mock_sess.get.return_value = mock_resp
-
-        with patch("scraper.schedule.requests.Session", return_value=mock_sess):
-            with patch("scraper.promotions._fetch_html", return_value=self.promos_html):
-                result = run(season=2026, dry_run=False)
-
-        self.assertTrue(result)
-
-        with get_conn(Path(self.tmp.name)) as conn:
-            count = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
-        self.assertEqual(count, 5)  # 5 home games in fixture
+        self.assertTrue(self.run_result)
+        self.assertEqual(self.games_count, 5)  # 5 home games in fixture
 
     def test_pipeline_handles_schedule_failure(self):
         """Schedule failure returns False (not crash)."""
-        import requests as req
-        from scraper.main import run
-        mock_sess = MagicMock()
-        mock_sess.get.side_effect = req.RequestException("network error")
+        self.session.get.side_effect = requests.RequestException("network error")
 
-        with patch("scraper.schedule.requests.Session", return_value=mock_sess):
-            result = run(season=2026, dry_run=False)
+        result = run(season=2026, dry_run=False)
         self.assertFalse(result)
 
     def test_pipeline_continues_on_promotions_failure(self):
         """Promotions failure is non-fatal — games still saved."""
-        from scraper.main import run
-        from admin.db import get_conn
-
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = self.api_data
-        mock_resp.raise_for_status.return_value = None
-        mock_sess = MagicMock()
-        mock_sess.get.return_value = mock_resp
-
-        with patch("scraper.schedule.requests.Session", return_value=mock_sess):
-            with patch("scraper.promotions._fetch_html", side_effect=Exception("promo page down")):
-                result = run(season=2026, dry_run=False)
+        with patch("scraper.promotions._fetch_html", side_effect=Exception("promo page down")):
+            result = run(season=2026, dry_run=False)
 
         self.assertTrue(result)  # still succeeds
 
-        with get_conn(Path(self.tmp.name)) as conn:
+        with get_conn(self.db_path) as conn:
             count = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
         self.assertEqual(count, 5)  # games saved despite promo failure
 
     def test_promotions_matched_to_games(self):
         """Promotions parsed from HTML are associated with correct game_ids."""
-        from scraper.main import run
-        from admin.db import get_conn
-
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = self.api_data
-        mock_resp.raise_for_status.return_value = None
-        mock_sess = MagicMock()
-        mock_sess.get.return_value = mock_resp
-
-        with patch("scraper.schedule.requests.Session", return_value=mock_sess):
-            with patch("scraper.promotions._fetch_html", return_value=self.promos_html):
-                run(season=2026, dry_run=False)
-
-        with get_conn(Path(self.tmp.name)) as conn:
-            promo_count = conn.execute("SELECT COUNT(*) FROM promotions").fetchone()[0]
-        # Apr 10 game has 2 promos in fixture
-        self.assertGreater(promo_count, 0)
+        # Apr 10 is the only fixture game with promos — 2 of them
+        self.assertEqual(self.promo_count, 2)
 
 
 if __name__ == "__main__":
-    unittest.main(verbosity=2)
+    # Load this module's TestCases directly — no argv parsing or discovery
+    suite  = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    sys.exit(0 if result.wasSuccessful() else 1)